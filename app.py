@@ -5,21 +5,33 @@ Aplicación educativa completa sobre teoría de números primos
 """
 
 import streamlit as st
+import math
+import os
 import time
 import pandas as pd
+import numpy as np
 from datetime import datetime
+from itertools import islice
 
 # Importar módulos personalizados
 from utils.prime_algorithms import (
     es_primo_basico, es_primo_con_pasos, criba_eratostenes,
-    criba_eratostenes_pasos, primos_en_rango, enesimo_primo,
+    criba_eratostenes_pasos, primos_en_rango, enesimo_primo, primos_desde_posicion,
     factorizacion_prima, factorizacion_con_proceso,
-    contar_primos_hasta, primos_gemelos, distancia_primo_mas_cercano
+    contar_primos_hasta, distancia_primo_mas_cercano, usar_base_primos,
+    iterar_constelaciones, es_parte_de_constelacion, CONSTELACIONES,
+    primo_aleatorio, generar_claves_rsa, factorizar_rango,
+    iterar_funciones_multiplicativas, AnalizadorBrechas,
+    conteos_goldbach, particiones_goldbach
 )
+from utils.prime_storage import abrir_base_primos
+from utils.prime_codec import codificar_primos, decodificar_primos, MIME_PRIMOS_CODIFICADOS
 from utils.visualizations import (
     grafico_distribucion_primos, grafico_funcion_pi, espiral_ulam,
     comparacion_primos_compuestos, visualizar_factorizacion,
-    heatmap_criba, grafico_brechas_primos, grafico_estadisticas_sesion
+    heatmap_criba, grafico_brechas_primos, grafico_estadisticas_sesion,
+    grafico_funcion_aritmetica, grafico_histograma_brechas, grafico_brechas_maximales,
+    grafico_cometa_goldbach
 )
 from utils.gamification import (
     generar_pregunta_quiz, verificar_respuesta, calcular_puntuacion,
@@ -42,6 +54,47 @@ st.set_page_config(
 )
 
 
+# Límites de las herramientas
+# Mayor entero que los widgets numéricos de Streamlit representan con exactitud
+MAX_NUMERO_VERIFICADOR = 2**53 - 1
+MAX_RANGO_PRIMOS = 10**12
+ANCHO_MAX_RANGO = 10**7
+MAX_CONTEO_PRIMOS = 10**12
+MAX_POSICION_PRIMO = 10**10
+MAX_FILAS_TABLA = 10000
+MAX_LIMITE_CONSTELACIONES = 10**10
+MAX_LIMITE_CRIBA = 10**5
+MAX_BITS_PRIMO_ALEATORIO = 2048
+MAX_BITS_PRIMO_SEGURO = 512
+ANCHO_MAX_FACTORIZACION = 10**6
+ANCHO_MAX_FUNCIONES = 10**6
+MAX_PUNTOS_GRAFICO = 20000
+MAX_LIMITE_BRECHAS = 10**11
+MAX_LIMITE_COMETA = 10**6
+MAX_NUMERO_GOLDBACH = 10**8
+
+# Funciones aritméticas: nombre interno -> nombre para mostrar
+NOMBRES_FUNCIONES = {
+    "phi": "φ(n) - Función de Euler",
+    "mu": "μ(n) - Función de Möbius",
+    "divisores": "d(n) - Cantidad de divisores",
+    "sigma": "σ(n) - Suma de divisores",
+}
+
+# Nombres para mostrar de las constelaciones de primos
+NOMBRES_CONSTELACIONES = {
+    "gemelos": "Primos gemelos (p, p+2)",
+    "primos_primos": "Primos primos (p, p+4)",
+    "sexys": "Primos sexys (p, p+6)",
+    "tripletes_a": "Tripletes (p, p+2, p+6)",
+    "tripletes_b": "Tripletes (p, p+4, p+6)",
+    "cuadrupletes": "Cuádruples (p, p+2, p+6, p+8)",
+}
+
+# Base de primos en disco opcional (se construye con python -m utils.prime_storage)
+RUTA_BASE_PRIMOS = os.environ.get("PRIMOS_DB")
+
+
 # ==================== CSS PERSONALIZADO ====================
 
 def load_custom_css():
@@ -94,14 +147,49 @@ def init_session_state():
         st.session_state.pregunta_actual = None
     if 'tiempo_pregunta' not in st.session_state:
         st.session_state.tiempo_pregunta = None
+    if 'limite_criba' not in st.session_state:
+        st.session_state.limite_criba = None
+    if 'analizador_brechas' not in st.session_state:
+        st.session_state.analizador_brechas = None
 
 
 # ==================== CACHÉ DE FUNCIONES ====================
 
 @st.cache_data
+def _primos_codificados_cached(limite):
+    """Guarda en caché los primos hasta limite en el formato compacto"""
+    return codificar_primos(criba_eratostenes(limite))
+
+
 def calcular_primos_cached(limite):
     """Calcula primos con caché"""
-    return criba_eratostenes(limite)
+    return decodificar_primos(_primos_codificados_cached(limite)).tolist()
+
+
+@st.cache_data
+def calcular_traza_criba_cached(limite):
+    """Calcula la traza de la criba con caché"""
+    return criba_eratostenes_pasos(limite)
+
+
+@st.cache_data
+def contar_primos_cached(x):
+    """Calcula π(x) con caché"""
+    return contar_primos_hasta(x)
+
+
+@st.cache_data
+def conteos_goldbach_cached(limite):
+    """Calcula las particiones de Goldbach de todos los pares hasta limite con caché"""
+    return conteos_goldbach(limite)
+
+
+@st.cache_resource
+def cargar_base_primos(ruta):
+    """Abre la base de primos en disco una sola vez y la registra"""
+    base = abrir_base_primos(ruta)
+    usar_base_primos(base)
+    return base
 
 
 # ==================== SIDEBAR ====================
@@ -164,7 +252,7 @@ def tab_verificador():
         numero = st.number_input(
             "Ingresa un número entero:",
             min_value=0,
-            max_value=1000000,
+            max_value=MAX_NUMERO_VERIFICADOR,
             value=17,
             step=1
         )
@@ -240,13 +328,12 @@ def tab_verificador():
                     st.write(f"**Distancia:** {info_distancia['distancia']}")
 
             with col2:
-                # Verificar si es parte de un par gemelo
+                # Verificar si es parte de alguna constelación (gemelos, tripletes...)
                 if es_primo:
-                    gemelos = primos_gemelos(numero + 10)
-                    for par in gemelos:
-                        if numero in par:
-                            st.success(f"¡Es parte del par gemelo {par}!")
-                            break
+                    for patron, nombre in NOMBRES_CONSTELACIONES.items():
+                        tupla = es_parte_de_constelacion(numero, patron)
+                        if tupla:
+                            st.success(f"{nombre}: ¡es parte de {tupla}!")
 
 
 # ==================== TAB 2: VISUALIZACIONES ====================
@@ -261,7 +348,7 @@ def tab_visualizaciones():
     tipo_viz = st.selectbox(
         "Selecciona una visualización:",
         ["Distribución de Primos", "Función π(x)", "Espiral de Ulam",
-         "Comparación Primos vs Compuestos", "Brechas entre Primos"]
+         "Comparación Primos vs Compuestos", "Brechas entre Primos", "Cometa de Goldbach"]
     )
 
     # Controles según el tipo
@@ -281,6 +368,15 @@ def tab_visualizaciones():
             st.plotly_chart(fig, use_container_width=True)
             st.info(f"π({limite}) = {len(primos)}")
 
+            st.markdown("**Calcular π(x) para valores grandes**")
+            x_grande = st.number_input("Valor de x:", 2, MAX_CONTEO_PRIMOS, 10**9)
+            if st.button("Calcular π(x)"):
+                with st.spinner("Contando primos..."):
+                    inicio = time.time()
+                    cantidad = contar_primos_cached(x_grande)
+                    tiempo_s = time.time() - inicio
+                st.success(f"π({x_grande:,}) = **{cantidad:,}** (calculado en {tiempo_s:.2f} s)")
+
         elif tipo_viz == "Comparación Primos vs Compuestos":
             fig = comparacion_primos_compuestos(limite, primos)
             st.plotly_chart(fig, use_container_width=True)
@@ -290,6 +386,46 @@ def tab_visualizaciones():
                 fig = grafico_brechas_primos(primos)
                 st.plotly_chart(fig, use_container_width=True)
 
+            st.markdown("**Estadísticas de brechas a gran escala**")
+            st.caption("El análisis avanza por tramos de 10⁸ números y queda guardado en la sesión: "
+                       "si lo interrumpes, al volver a pulsar el botón continúa desde el último tramo.")
+            hasta_brechas = st.number_input("Analizar brechas hasta:", 10**4, MAX_LIMITE_BRECHAS, 10**8)
+
+            analizador = st.session_state.analizador_brechas
+            if st.button("Analizar brechas"):
+                if analizador is None or analizador.hasta > hasta_brechas:
+                    analizador = AnalizadorBrechas()
+                    st.session_state.analizador_brechas = analizador
+
+                barra = st.progress(min(analizador.hasta / hasta_brechas, 1.0))
+                for punto in analizador.avanzar(hasta_brechas):
+                    barra.progress(punto["hasta"] / hasta_brechas)
+
+            if analizador is not None:
+                col1, col2, col3, col4 = st.columns(4)
+                with col1:
+                    st.metric("Analizado hasta", f"{analizador.hasta:,}")
+                with col2:
+                    st.metric("Primos", f"{analizador.cantidad_primos:,}")
+                with col3:
+                    st.metric("Brecha máxima", analizador.brecha_maxima)
+                with col4:
+                    st.metric("Campeón de saltos", analizador.campeon)
+
+                fig = grafico_histograma_brechas(analizador.histograma)
+                st.plotly_chart(fig, use_container_width=True)
+                fig = grafico_brechas_maximales(analizador.records)
+                st.plotly_chart(fig, use_container_width=True)
+
+                with st.expander("📋 Brechas máximas y su primera aparición"):
+                    df = pd.DataFrame(analizador.records,
+                                      columns=["Brecha", "Primo inicial", "g / ln²(p)"])
+                    st.dataframe(df, use_container_width=True)
+
+                with st.expander("🏅 Cambios del campeón de saltos"):
+                    df = pd.DataFrame(analizador.campeones, columns=["Desde el primo", "Brecha más frecuente"])
+                    st.dataframe(df, use_container_width=True)
+
     elif tipo_viz == "Espiral de Ulam":
         dimension = st.slider("Dimensión de la espiral:", 11, 101, 51, 2)
 
@@ -301,6 +437,28 @@ def tab_visualizaciones():
 
         st.info("La Espiral de Ulam muestra patrones sorprendentes en la distribución de primos. Los números primos aparecen en azul.")
 
+    elif tipo_viz == "Cometa de Goldbach":
+        limite_cometa = st.select_slider("Números pares hasta:",
+                                         [10**3, 10**4, 10**5, MAX_LIMITE_COMETA], 10**5)
+
+        with st.spinner("Contando particiones de Goldbach..."):
+            conteos = conteos_goldbach_cached(limite_cometa)
+            fig = grafico_cometa_goldbach(conteos)
+            st.plotly_chart(fig, use_container_width=True)
+
+        st.info(f"Todos los pares entre 4 y {limite_cometa:,} tienen al menos "
+                f"**{int(conteos[2:].min())}** partición(es) como suma de dos primos.")
+
+        st.markdown("**Particiones de un número par**")
+        n_par = st.number_input("Número par:", 4, MAX_NUMERO_GOLDBACH, 100, 2)
+        if n_par % 2:
+            st.warning("Ingresa un número par.")
+        else:
+            particiones = particiones_goldbach(n_par)
+            st.success(f"{n_par:,} se puede escribir de **{len(particiones):,}** formas como p + q")
+            df = pd.DataFrame(particiones[:MAX_FILAS_TABLA], columns=["p", "q"])
+            st.dataframe(df, use_container_width=True)
+
 
 # ==================== TAB 3: CRIBA DE ERATÓSTENES ====================
 
@@ -330,40 +488,51 @@ def tab_criba():
     # Controles
     col1, col2 = st.columns([3, 1])
     with col1:
-        limite_criba = st.slider("Límite para la criba:", 10, 200, 50, 5)
+        limite_criba = st.number_input("Límite para la criba:", 10, MAX_LIMITE_CRIBA, 50, 5)
     with col2:
         st.write("")
         st.write("")
-        ejecutar = st.button("▶️ Ejecutar Criba", use_container_width=True, type="primary")
+        if st.button("▶️ Ejecutar Criba", use_container_width=True, type="primary"):
+            st.session_state.limite_criba = limite_criba
 
-    if ejecutar:
+    # La traza queda en caché, así que mover el paso no vuelve a ejecutar la criba
+    limite = st.session_state.limite_criba
+    if limite:
         with st.spinner("Ejecutando Criba de Eratóstenes..."):
-            pasos = criba_eratostenes_pasos(limite_criba)
+            traza = calcular_traza_criba_cached(limite)
 
-            if pasos:
-                st.success(f"Criba completada. Se encontraron primos hasta {limite_criba}.")
+        st.success(f"Criba completada. Se encontraron primos hasta {limite}.")
 
-                # Mostrar visualización final
-                estado_final = pasos[-1]["estado"]
-                primos_encontrados = [i for i, es_primo in enumerate(estado_final) if es_primo]
+        primos_encontrados = np.flatnonzero(traza.estado(-1)).tolist()
 
-                st.write(f"**Números primos encontrados ({len(primos_encontrados)}):**")
-                st.write(", ".join(map(str, primos_encontrados[:50])))
-                if len(primos_encontrados) > 50:
-                    st.write(f"... y {len(primos_encontrados) - 50} más")
+        st.write(f"**Números primos encontrados ({len(primos_encontrados)}):**")
+        st.write(", ".join(map(str, primos_encontrados[:50])))
+        if len(primos_encontrados) > 50:
+            st.write(f"... y {len(primos_encontrados) - 50} más")
 
-                # Visualización con heatmap
-                if limite_criba <= 100:
-                    dimension = 10
-                    fig = heatmap_criba(estado_final, dimension)
-                    st.plotly_chart(fig, use_container_width=True)
+        # Animación: cualquier paso se reconstruye a partir de la traza
+        paso = len(traza) - 1
+        if len(traza) > 1:
+            paso = st.slider("Paso de la criba:", 0, len(traza) - 1, len(traza) - 1)
+
+        cuadro = traza[paso]
+        if cuadro["accion"] == "marcar_multiplos":
+            st.caption(f"Paso {paso}: se marcan {len(cuadro['marcados']):,} múltiplos de "
+                       f"{cuadro['numero_actual']} (en naranja).")
+        else:
+            st.caption("Estado inicial: todos los números desde 2 están sin marcar.")
+
+        # Visualización con heatmap
+        dimension = 10 if limite <= 100 else math.ceil(math.sqrt(limite + 1))
+        fig = heatmap_criba(cuadro["estado"], dimension, cuadro["marcados"])
+        st.plotly_chart(fig, use_container_width=True)
 
-                # Mostrar algunos pasos
-                if st.checkbox("Ver pasos detallados"):
-                    for i, paso in enumerate(pasos[:10]):  # Primeros 10 pasos
-                        if paso["accion"] == "marcar_multiplos":
-                            st.write(f"**Paso {i+1}:** Marcando múltiplos de {paso['numero_actual']}")
-                            st.write(f"Marcados: {paso['marcados'][:10]}{'...' if len(paso['marcados']) > 10 else ''}")
+        # Mostrar algunos pasos
+        if st.checkbox("Ver pasos detallados"):
+            for i, detalle in enumerate(islice(traza.reproducir(1), 10)):  # Primeros 10 pasos
+                marcados = detalle["marcados"][:10].tolist()
+                st.write(f"**Paso {i+1}:** Marcando múltiplos de {detalle['numero_actual']}")
+                st.write(f"Marcados: {marcados}{'...' if len(detalle['marcados']) > 10 else ''}")
 
 
 # ==================== TAB 4: HERRAMIENTAS ====================
@@ -375,7 +544,8 @@ def tab_herramientas():
     herramienta = st.selectbox(
         "Selecciona una herramienta:",
         ["Generador de Primos en Rango", "Factorización Prima",
-         "Tabla de Primeros N Primos", "Buscar N-ésimo Primo", "Primos Gemelos"]
+         "Tabla de Primeros N Primos", "Buscar N-ésimo Primo", "Constelaciones de Primos",
+         "Factorización de Rango", "Funciones Aritméticas", "Primos Aleatorios y RSA"]
     )
 
     st.markdown("---")
@@ -385,11 +555,17 @@ def tab_herramientas():
 
         col1, col2 = st.columns(2)
         with col1:
-            inicio = st.number_input("Inicio del rango:", 0, 100000, 10)
+            inicio = st.number_input("Inicio del rango:", 0, MAX_RANGO_PRIMOS, 10)
         with col2:
-            fin = st.number_input("Fin del rango:", inicio, 100000, 100)
+            fin = st.number_input("Fin del rango:", inicio, MAX_RANGO_PRIMOS, max(inicio, 100))
+
+        st.caption(f"La criba segmentada admite rangos de hasta {ANCHO_MAX_RANGO:,} números de ancho.")
 
         if st.button("Generar"):
+            if fin - inicio + 1 > ANCHO_MAX_RANGO:
+                st.warning(f"El rango es demasiado ancho. Reduce el ancho a {ANCHO_MAX_RANGO:,} números o menos.")
+                return
+
             with st.spinner("Buscando primos..."):
                 primos = primos_en_rango(inicio, fin)
                 st.success(f"Se encontraron **{len(primos)}** primos entre {inicio} y {fin}.")
@@ -399,20 +575,31 @@ def tab_herramientas():
                     if len(primos) > 100:
                         st.write(f"... y {len(primos) - 100} más")
 
-                    # Opción de descarga
-                    df = pd.DataFrame({"Primos": primos})
-                    csv = df.to_csv(index=False)
-                    st.download_button(
-                        "📥 Descargar como CSV",
-                        csv,
-                        "primos.csv",
-                        "text/csv"
-                    )
+                    # Opciones de descarga
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        df = pd.DataFrame({"Primos": primos})
+                        csv = df.to_csv(index=False)
+                        st.download_button(
+                            "📥 Descargar como CSV",
+                            csv,
+                            "primos.csv",
+                            "text/csv"
+                        )
+                    with col2:
+                        st.download_button(
+                            "📦 Descargar comprimido",
+                            codificar_primos(primos),
+                            "primos.primgaps",
+                            MIME_PRIMOS_CODIFICADOS,
+                            help="Brechas entre primos como varint (≈ 1 byte por primo). "
+                                 "Se lee con utils.prime_codec.decodificar_primos."
+                        )
 
     elif herramienta == "Factorización Prima":
         st.subheader("Calculadora de Factorización Prima")
 
-        numero = st.number_input("Número a factorizar:", 2, 1000000, 60)
+        numero = st.number_input("Número a factorizar:", 2, MAX_NUMERO_VERIFICADOR, 60)
 
         if st.button("Factorizar"):
             factores = factorizacion_prima(numero)
@@ -439,25 +626,21 @@ def tab_herramientas():
     elif herramienta == "Tabla de Primeros N Primos":
         st.subheader("Tabla de Primeros N Números Primos")
 
-        n = st.number_input("¿Cuántos primos quieres generar?", 1, 1000, 50)
+        col1, col2 = st.columns(2)
+        with col1:
+            n = st.number_input("¿Cuántos primos quieres generar?", 1, MAX_FILAS_TABLA, 50)
+        with col2:
+            desde = st.number_input("Desde la posición:", 1, MAX_POSICION_PRIMO, 1)
 
         if st.button("Generar Tabla"):
             with st.spinner("Generando primos..."):
-                # Estimar límite
-                if n < 10:
-                    limite = 30
-                else:
-                    import math
-                    limite = int(n * (math.log(n) + math.log(math.log(n)) + 2))
-
-                primos = calcular_primos_cached(limite)
-                primeros_n = primos[:n]
+                primeros_n = primos_desde_posicion(desde, n)
 
-                st.success(f"Primeros {n} números primos generados.")
+                st.success(f"{n} números primos generados a partir de la posición {desde}.")
 
                 # Crear tabla
                 df = pd.DataFrame({
-                    "Posición": range(1, len(primeros_n) + 1),
+                    "Posición": range(desde, desde + len(primeros_n)),
                     "Primo": primeros_n
                 })
 
@@ -466,7 +649,7 @@ def tab_herramientas():
     elif herramienta == "Buscar N-ésimo Primo":
         st.subheader("Encontrar el N-ésimo Número Primo")
 
-        n = st.number_input("Posición del primo (n):", 1, 10000, 10)
+        n = st.number_input("Posición del primo (n):", 1, MAX_POSICION_PRIMO, 10)
 
         if st.button("Buscar"):
             with st.spinner("Buscando..."):
@@ -475,23 +658,171 @@ def tab_herramientas():
 
                 st.info(f"Por ejemplo: el 1er primo es 2, el 10mo primo es 29, el 100vo primo es 541.")
 
-    elif herramienta == "Primos Gemelos":
-        st.subheader("Encontrar Pares de Primos Gemelos")
+    elif herramienta == "Constelaciones de Primos":
+        st.subheader("Encontrar Constelaciones de Primos")
 
-        st.info("Los primos gemelos son pares de primos que difieren en 2, como (3,5), (11,13), (17,19).")
+        st.info("Una constelación es un grupo de primos con separaciones fijas, como los "
+                "primos gemelos (3,5), (11,13) o los cuádruples (5,7,11,13).")
 
-        limite = st.number_input("Buscar hasta:", 10, 10000, 100)
+        col1, col2 = st.columns(2)
+        with col1:
+            patron = st.selectbox("Constelación:", list(NOMBRES_CONSTELACIONES),
+                                  format_func=NOMBRES_CONSTELACIONES.get)
+        with col2:
+            limite = st.number_input("Buscar hasta:", 10, MAX_LIMITE_CONSTELACIONES, 100)
+
+        if st.button("Buscar Constelaciones"):
+            with st.spinner("Buscando constelaciones..."):
+                # Una sola pasada: se cuentan todas y se guardan las primeras para la tabla
+                conteo = 0
+                primeros = []
+                for bloque in iterar_constelaciones(patron, 2, limite):
+                    conteo += len(bloque)
+                    if len(primeros) < MAX_FILAS_TABLA:
+                        primeros.extend(bloque[:MAX_FILAS_TABLA - len(primeros)].tolist())
+
+                st.success(f"Se encontraron **{conteo:,}** constelaciones hasta {limite:,}.")
+
+                if primeros:
+                    desplazamientos = CONSTELACIONES[patron]
+                    df = pd.DataFrame(
+                        [[p + d for d in desplazamientos] for p in primeros],
+                        columns=[f"Primo {i + 1}" for i in range(len(desplazamientos))]
+                    )
+                    if conteo > len(primeros):
+                        st.caption(f"Se muestran las primeras {len(primeros):,}.")
+                    st.dataframe(df, use_container_width=True, height=400)
 
-        if st.button("Buscar Gemelos"):
-            with st.spinner("Buscando primos gemelos..."):
-                gemelos = primos_gemelos(limite)
+    elif herramienta == "Factorización de Rango":
+        st.subheader("Factorizar Todos los Números de un Rango")
 
-                st.success(f"Se encontraron **{len(gemelos)}** pares de primos gemelos hasta {limite}.")
+        col1, col2 = st.columns(2)
+        with col1:
+            inicio = st.number_input("Inicio del rango:", 2, MAX_RANGO_PRIMOS, 2)
+        with col2:
+            fin = st.number_input("Fin del rango:", inicio, MAX_RANGO_PRIMOS, max(inicio, 100))
+
+        st.caption(f"Se factoriza el rango completo con una criba segmentada; "
+                   f"admite hasta {ANCHO_MAX_FACTORIZACION:,} números.")
+
+        if st.button("Factorizar Rango"):
+            if fin - inicio + 1 > ANCHO_MAX_FACTORIZACION:
+                st.warning(f"El rango es demasiado ancho. Reduce el ancho a {ANCHO_MAX_FACTORIZACION:,} números o menos.")
+                return
+
+            with st.spinner("Factorizando..."):
+                # Una sola pasada: filas para la tabla y líneas para el CSV
+                filas = []
+                lineas = ["Número,Factorización"]
+                for n, factores in factorizar_rango(inicio, fin):
+                    expresion = " × ".join(
+                        f"{f}^{e}" if e > 1 else f"{f}" for f, e in factores.items()
+                    )
+                    if len(filas) < MAX_FILAS_TABLA:
+                        filas.append({"Número": n, "Factorización": expresion,
+                                      "¿Primo?": "✅" if factores == {n: 1} else ""})
+                    lineas.append(f"{n},{expresion}")
+
+            st.success(f"Se factorizaron **{len(lineas) - 1:,}** números.")
+            if len(lineas) - 1 > len(filas):
+                st.caption(f"Se muestran las primeras {len(filas):,} filas; el CSV las incluye todas.")
+            st.dataframe(pd.DataFrame(filas), use_container_width=True, height=400)
+
+            st.download_button(
+                "📥 Descargar como CSV",
+                "\n".join(lineas),
+                "factorizaciones.csv",
+                "text/csv"
+            )
+
+    elif herramienta == "Funciones Aritméticas":
+        st.subheader("Funciones Aritméticas φ, μ, d y σ")
+
+        st.info("φ(n) cuenta los números menores que n coprimos con n, μ(n) vale 0 si n tiene "
+                "un cuadrado como factor y (-1)^k si tiene k factores primos distintos, "
+                "d(n) cuenta los divisores de n y σ(n) los suma.")
 
-                if gemelos:
-                    # Mostrar en tabla
-                    df = pd.DataFrame(gemelos, columns=["Primo 1", "Primo 2"])
-                    st.dataframe(df, use_container_width=True, height=400)
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            inicio = st.number_input("Desde n =", 1, MAX_RANGO_PRIMOS, 1)
+        with col2:
+            fin = st.number_input("Hasta n =", inicio, MAX_RANGO_PRIMOS, max(inicio, 1000))
+        with col3:
+            funcion = st.selectbox("Función a graficar:", list(NOMBRES_FUNCIONES),
+                                   format_func=NOMBRES_FUNCIONES.get)
+
+        if st.button("Calcular Funciones"):
+            if fin - inicio + 1 > ANCHO_MAX_FUNCIONES:
+                st.warning(f"El rango es demasiado ancho. Reduce el ancho a {ANCHO_MAX_FUNCIONES:,} números o menos.")
+                return
+
+            with st.spinner("Calculando..."):
+                bloques = list(iterar_funciones_multiplicativas(inicio, fin))
+                numeros = np.concatenate([numeros for numeros, _ in bloques])
+                valores = {
+                    nombre: np.concatenate([v[nombre] for _, v in bloques])
+                    for nombre in NOMBRES_FUNCIONES
+                }
+
+            df = pd.DataFrame({"n": numeros, "φ(n)": valores["phi"], "μ(n)": valores["mu"],
+                               "d(n)": valores["divisores"], "σ(n)": valores["sigma"]})
+
+            # El gráfico se submuestrea para no enviar demasiados puntos al navegador
+            paso = max(1, len(numeros) // MAX_PUNTOS_GRAFICO)
+            fig = grafico_funcion_aritmetica(numeros[::paso], valores[funcion][::paso], funcion)
+            st.plotly_chart(fig, use_container_width=True)
+
+            st.dataframe(df.head(MAX_FILAS_TABLA), use_container_width=True, height=400)
+            st.download_button(
+                "📥 Descargar como CSV",
+                df.to_csv(index=False),
+                "funciones_aritmeticas.csv",
+                "text/csv"
+            )
+
+    elif herramienta == "Primos Aleatorios y RSA":
+        st.subheader("Generar Primos Aleatorios y Claves RSA")
+
+        st.info("La criptografía RSA usa primos de cientos de dígitos elegidos al azar. "
+                "Aquí se generan con una fuente de aleatoriedad criptográfica y el test de Baillie-PSW.")
+
+        col1, col2 = st.columns(2)
+        with col1:
+            seguro = st.checkbox("Primo seguro (p = 2q + 1 con q primo)")
+        with col2:
+            max_bits = MAX_BITS_PRIMO_SEGURO if seguro else MAX_BITS_PRIMO_ALEATORIO
+            bits = st.number_input("Cantidad de bits:", 3, max_bits, min(256, max_bits))
+
+        if st.button("Generar Primo"):
+            with st.spinner("Buscando un primo..."):
+                inicio = time.time()
+                primo = primo_aleatorio(bits, seguro)
+                tiempo_ms = (time.time() - inicio) * 1000
+
+            st.success(f"Primo de {bits} bits ({len(str(primo))} dígitos) generado en {tiempo_ms:.0f} ms:")
+            st.code(str(primo))
+
+        st.markdown("---")
+
+        bits_rsa = st.selectbox("Tamaño del módulo RSA:", [512, 1024, 2048, 3072], index=2)
+
+        if st.button("Generar Claves RSA"):
+            with st.spinner("Generando claves..."):
+                inicio = time.time()
+                claves = generar_claves_rsa(bits_rsa)
+                tiempo_ms = (time.time() - inicio) * 1000
+
+            st.success(f"Par de claves de {bits_rsa} bits generado en {tiempo_ms:.0f} ms.")
+            st.write("**Clave pública (n, e):**")
+            st.code(f"n = {claves['n']}\ne = {claves['e']}")
+            st.write("**Clave privada (d):**")
+            st.code(f"d = {claves['d']}")
+
+            # Comprobación: cifrar y descifrar un mensaje numérico
+            mensaje = 42
+            cifrado = pow(mensaje, claves["e"], claves["n"])
+            descifrado = pow(cifrado, claves["d"], claves["n"])
+            st.write(f"Comprobación: cifrar {mensaje} y descifrarlo devuelve **{descifrado}**.")
 
 
 # ==================== TAB 5: TEORÍA ====================
@@ -622,6 +953,11 @@ def tab_estadisticas():
     with col4:
         st.metric("Mayor Primo", st.session_state.primo_mas_grande_encontrado)
 
+    mayor_primo = st.session_state.primo_mas_grande_encontrado
+    if 2 <= mayor_primo <= MAX_CONTEO_PRIMOS:
+        posicion = contar_primos_cached(mayor_primo)
+        st.caption(f"Tu mayor primo, {mayor_primo:,}, es el primo número {posicion:,} (π({mayor_primo:,}) = {posicion:,}).")
+
     st.markdown("---")
 
     # Historial de verificaciones
@@ -671,6 +1007,8 @@ def main():
     # Inicialización
     load_custom_css()
     init_session_state()
+    if RUTA_BASE_PRIMOS:
+        cargar_base_primos(RUTA_BASE_PRIMOS)
 
     # Header
     st.markdown('<div class="main-header"><h1>🔢 Academia Interactiva de Números Primos</h1><p>Explora, aprende y domina la teoría de números primos</p></div>', unsafe_allow_html=True)
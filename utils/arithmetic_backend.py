@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de aritmética de enteros grandes
+Operaciones básicas (potencia modular, mcd, raíces enteras, símbolo de Jacobi)
+que usan gmpy2 si está instalado y Python puro en caso contrario
+
+gmpy2 es opcional: sin él todo funciona igual, solo que más lento con
+números de cientos de dígitos. Para activarlo basta con:
+    pip install gmpy2
+"""
+
+import math
+
+try:
+    import gmpy2
+except ImportError:
+    gmpy2 = None
+
+
+# Indica si las operaciones se delegan en gmpy2 (GMP)
+GMPY2_DISPONIBLE = gmpy2 is not None
+
+
+# ==================== CONVERSIÓN ====================
+
+def entero(n: int):
+    """
+    Convierte n al tipo entero más rápido disponible (mpz de gmpy2 o int).
+
+    Útil en bucles que hacen muchas operaciones con el mismo número grande:
+    los mpz se combinan con int y mantienen toda la aritmética en GMP.
+    """
+    return gmpy2.mpz(n) if GMPY2_DISPONIBLE else n
+
+
+# ==================== OPERACIONES ====================
+# Todas las funciones retornan int de Python (o bool), nunca mpz
+
+def potencia_modular(base: int, exponente: int, modulo: int) -> int:
+    """base^exponente mod modulo (el exponente puede ser -1 para el inverso)."""
+    if GMPY2_DISPONIBLE:
+        return int(gmpy2.powmod(base, exponente, modulo))
+    return pow(base, exponente, modulo)
+
+
+def mcd(a: int, b: int) -> int:
+    """Máximo común divisor de a y b."""
+    if GMPY2_DISPONIBLE:
+        return int(gmpy2.gcd(a, b))
+    return math.gcd(a, b)
+
+
+def raiz_cuadrada_entera(n: int) -> int:
+    """Parte entera de √n para n ≥ 0."""
+    if GMPY2_DISPONIBLE:
+        return int(gmpy2.isqrt(n))
+    return math.isqrt(n)
+
+
+def raiz_entera(n: int, k: int) -> int:
+    """
+    Raíz k-ésima entera de n (la parte entera de n^(1/k)), sin flotantes.
+
+    Sin gmpy2 usa el método de Newton con aritmética entera, como math.isqrt,
+    partiendo de una potencia de 2 mayor que la raíz para que la sucesión
+    decrezca.
+
+    Args:
+        n: Número no negativo
+        k: Índice de la raíz (k ≥ 1)
+
+    Returns:
+        El mayor entero r tal que r^k ≤ n
+    """
+    if n < 0 or k < 1:
+        raise ValueError("Se requiere n ≥ 0 y k ≥ 1")
+    if k == 1 or n < 2:
+        return n
+    if GMPY2_DISPONIBLE:
+        return int(gmpy2.iroot(n, k)[0])
+    if k == 2:
+        return math.isqrt(n)
+    if k >= n.bit_length():
+        return 1
+
+    x = 1 << -(-n.bit_length() // k)
+    while True:
+        y = ((k - 1) * x + n // x ** (k - 1)) // k
+        if y >= x:
+            return x
+        x = y
+
+
+def es_cuadrado_perfecto(n: int) -> bool:
+    """Indica si n es el cuadrado de un entero."""
+    if n < 0:
+        return False
+    if GMPY2_DISPONIBLE:
+        return bool(gmpy2.is_square(n))
+    return math.isqrt(n) ** 2 == n
+
+
+def simbolo_jacobi(a: int, n: int) -> int:
+    """Símbolo de Jacobi (a/n) para n impar positivo."""
+    if GMPY2_DISPONIBLE:
+        return int(gmpy2.jacobi(a, n))
+
+    a %= n
+    resultado = 1
+
+    while a:
+        while a % 2 == 0:
+            a //= 2
+            if n % 8 in (3, 5):
+                resultado = -resultado
+        a, n = n, a
+        if a % 4 == 3 and n % 4 == 3:
+            resultado = -resultado
+        a %= n
+
+    return resultado if n == 1 else 0
@@ -233,6 +233,18 @@ def obtener_teoremas_importantes() -> str:
 > Si \( a \) y \( b \) son coprimos, existen infinitos primos de la forma \( a + nb \).
 
 **Ejemplo:** Infinitos primos terminan en 1, 3, 7 o 9 (base 10).
+
+---
+
+### 8. Conjetura de Goldbach (No demostrada)
+
+**Enunciado:**
+> Todo número par mayor que 2 es la suma de dos números primos.
+
+**Ejemplos:** 4 = 2 + 2, 10 = 3 + 7 = 5 + 5, 100 = 3 + 97 = 11 + 89 = ...
+
+**Estado:** Verificada por computadora hasta 4 × 10¹⁸. La cantidad de particiones
+crece con el número (el "cometa de Goldbach"), lo que hace muy creíble la conjetura.
 """
 
 
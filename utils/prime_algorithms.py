@@ -4,9 +4,70 @@ Módulo de algoritmos para números primos
 Contiene funciones para verificación, generación y análisis de números primos
 """
 
+import json
 import math
+import os
 import random
-from typing import List, Dict, Tuple
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice, repeat
+from typing import List, Dict, Tuple, Iterator
+
+import numpy as np
+
+from utils.arithmetic_backend import (
+    entero, potencia_modular, mcd, raiz_entera, es_cuadrado_perfecto, simbolo_jacobi
+)
+from utils.prime_codec import codificar_primos, decodificar_primos
+
+
+# Tamaño (en números) de cada bloque de la criba segmentada.
+# 2^18 bytes caben holgadamente en la caché L2 de un procesador moderno.
+TAMANO_BLOQUE_CRIBA = 1 << 18
+
+# A partir de este valor es_primo_basico usa Miller-Rabin determinista
+# en lugar de división por prueba.
+UMBRAL_MILLER_RABIN = 10**6
+
+# Hasta este valor es_primo_lote responde consultando una criba en caché
+UMBRAL_LOTE_CRIBA = 10**7
+
+# Límite de la tabla de primos pequeños usada como pre-filtro
+LIMITE_PRIMOS_PEQUENOS = 1000
+
+# A partir de este valor π(x) se calcula con el método sublineal
+UMBRAL_CONTEO_SUBLINEAL = 10**5
+
+# Mayor número que puede llegar a cubrir la tabla compartida de primos
+# (los primos se guardan como uint32, así que debe ser menor que 2^32)
+LIMITE_TABLA_PRIMOS = 10**8
+
+# Límite por defecto de la tabla de factor primo mínimo
+LIMITE_TABLA_FACTOR_MINIMO = 10**6
+
+# Los primos menores que este valor criban la ventana alrededor de n
+# al buscar el primo siguiente, anterior o más cercano a un n grande
+LIMITE_CRIBA_VENTANA = 1 << 16
+
+# Una consulta puntual (siguiente, anterior, más cercano) solo usa la tabla
+# compartida si n es menor que este factor por el límite actual de la tabla
+FACTOR_EXTENSION_TABLA = 2
+
+# Conjuntos mínimos de testigos conocidos para Miller-Rabin determinista:
+# si n < cota, basta con probar las bases indicadas.
+TESTIGOS_DETERMINISTAS = [
+    (2047, (2,)),
+    (1373653, (2, 3)),
+    (9080191, (31, 73)),
+    (4759123141, (2, 7, 61)),
+    (1122004669633, (2, 13, 23, 1662803)),
+    (2152302898747, (2, 3, 5, 7, 11)),
+    (3474749660383, (2, 3, 5, 7, 11, 13)),
+    (341550071728321, (2, 3, 5, 7, 11, 13, 17)),
+    (3825123056546413051, (2, 3, 5, 7, 11, 13, 17, 19, 23)),
+    (1 << 64, (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)),
+]
 
 
 # ==================== VERIFICACIÓN DE PRIMALIDAD ====================
@@ -19,312 +80,1978 @@ def es_primo_basico(numero: int) -> bool:
         numero: Número entero a verificar
 
     Returns:
-        True si es primo, False en caso contrario
+        True si es primo, False en caso contrario
+    """
+    if numero <= 1:
+        return False
+    if numero <= 3:
+        return True
+
+    # Para números grandes la división por prueba es demasiado lenta
+    if numero >= UMBRAL_MILLER_RABIN:
+        if _base_cubre(numero):
+            return _base_primos.es_primo(numero)
+        return es_primo_miller_rabin(numero, determinista=True)
+
+    # Optimización: solo probar divisores primos hasta √n
+    for divisor in _divisores_de_prueba(math.isqrt(numero)):
+        if numero % divisor == 0:
+            return False
+
+    return True
+
+
+def es_primo_con_pasos(numero: int) -> Tuple[bool, Dict[str, np.ndarray]]:
+    """
+    Verifica si un número es primo y retorna los pasos del proceso.
+
+    Args:
+        numero: Número entero a verificar
+
+    Returns:
+        Tupla (es_primo, pasos), donde pasos tiene un arreglo por columna:
+        {"divisor": ..., "es_divisible": ..., "resto": ...}, con una
+        posición por divisor probado (sirve directo para pd.DataFrame)
+    """
+    divisores = []
+    if numero > 2:
+        # Solo se prueban divisores primos, y hasta 100 para la visualización
+        divisores = list(_divisores_de_prueba(min(math.isqrt(numero), 99)))
+
+    restos = np.array([numero % d for d in divisores], dtype=np.int64)
+    es_divisible = restos == 0
+    if es_divisible.any():
+        # Los pasos terminan en el primer divisor encontrado
+        fin = int(np.argmax(es_divisible)) + 1
+        divisores, restos, es_divisible = divisores[:fin], restos[:fin], es_divisible[:fin]
+
+    pasos = {
+        "divisor": np.array(divisores, dtype=np.int64),
+        "es_divisible": es_divisible,
+        "resto": restos
+    }
+
+    if numero <= 1 or es_divisible.any():
+        return False, pasos
+    if numero == 2:
+        return True, pasos
+
+    raiz = math.isqrt(numero)
+
+    # Si el número es grande y no encontramos divisor en los primeros 100
+    if raiz >= 100:
+        es_primo = es_primo_basico(numero)
+        return es_primo, pasos
+
+    return True, pasos
+
+
+@lru_cache(maxsize=None)
+def _primos_pequenos() -> Tuple[int, ...]:
+    """Tabla en caché de los primos hasta LIMITE_PRIMOS_PEQUENOS."""
+    return tuple(criba_eratostenes(LIMITE_PRIMOS_PEQUENOS))
+
+
+def _divisores_de_prueba(limite: int) -> Iterator[int]:
+    """
+    Divisores primos para la división por prueba hasta limite.
+
+    Recorre la tabla en caché de primos pequeños. Los llamadores nunca
+    superan LIMITE_PRIMOS_PEQUENOS: es_primo_basico pasa a Miller-Rabin
+    desde UMBRAL_MILLER_RABIN (√n < 1000) y es_primo_con_pasos se detiene en 99.
+    """
+    for p in _primos_pequenos():
+        if p > limite:
+            return
+        yield p
+
+
+def _es_testigo_de_compuesto(a: int, n: int, d: int, r: int) -> bool:
+    """
+    Ronda de Miller-Rabin con base a, donde n - 1 = 2^r * d con d impar.
+
+    Returns:
+        True si a demuestra que n es compuesto
+    """
+    x = potencia_modular(a, d, n)
+    if x == 1 or x == n - 1:
+        return False
+
+    for _ in range(r - 1):
+        x = potencia_modular(x, 2, n)
+        if x == n - 1:
+            return False
+
+    return True
+
+
+def es_primo_miller_rabin(n: int, k: int = 5, determinista: bool = False) -> bool:
+    """
+    Test de primalidad de Miller-Rabin.
+    Útil para números muy grandes.
+
+    En modo determinista se hace primero división por prueba con los primos
+    pequeños y luego se usan los conjuntos mínimos de testigos conocidos,
+    por lo que el resultado es exacto para n < 2^64. Por encima de 2^64 se
+    aplica el test de Baillie-PSW (ver es_primo_bpsw), que es reproducible
+    y no tiene contraejemplos conocidos.
+
+    Args:
+        n: Número a verificar
+        k: Número de rondas aleatorias (mayor k = mayor precisión)
+        determinista: Usar testigos fijos en lugar de aleatorios
+
+    Returns:
+        True si probablemente es primo, False si definitivamente es compuesto
+    """
+    if n < 2:
+        return False
+    if n == 2 or n == 3:
+        return True
+    if n % 2 == 0:
+        return False
+
+    if not determinista:
+        return _pasa_miller_rabin(n, [random.randrange(2, n - 1) for _ in range(k)])
+
+    for p in _primos_pequenos():
+        if n % p == 0:
+            return n == p
+    if n < LIMITE_PRIMOS_PEQUENOS ** 2:
+        return True
+
+    return _pasa_test_determinista(n)
+
+
+def _pasa_test_determinista(n: int) -> bool:
+    """
+    Test determinista para un impar n sin factores primos pequeños:
+    testigos fijos por debajo de 2^64 y Baillie-PSW por encima.
+    """
+    if n >= TESTIGOS_DETERMINISTAS[-1][0]:
+        return _pasa_miller_rabin(n, (2,)) and _pasa_lucas_fuerte(n)
+    return _pasa_miller_rabin(n, _testigos_fijos(n))
+
+
+def es_primo_bpsw(n: int) -> bool:
+    """
+    Test de primalidad de Baillie-PSW.
+
+    Combina Miller-Rabin fuerte en base 2 con el test de Lucas fuerte con
+    parámetros de Selfridge. Ningún compuesto conocido pasa ambos, y el
+    resultado no depende de elecciones aleatorias.
+
+    Args:
+        n: Número a verificar (de cualquier tamaño)
+
+    Returns:
+        True si n pasa el test (es primo salvo contraejemplo desconocido)
+    """
+    if n < 2:
+        return False
+
+    for p in _primos_pequenos():
+        if n % p == 0:
+            return n == p
+    if n < LIMITE_PRIMOS_PEQUENOS ** 2:
+        return True
+
+    return _pasa_miller_rabin(n, (2,)) and _pasa_lucas_fuerte(n)
+
+
+def _testigos_fijos(n: int) -> Tuple[int, ...]:
+    """Conjunto mínimo de testigos deterministas para n (ver TESTIGOS_DETERMINISTAS)."""
+    for cota, bases in TESTIGOS_DETERMINISTAS:
+        if n < cota:
+            return bases
+    return TESTIGOS_DETERMINISTAS[-1][1]
+
+
+def _pasa_miller_rabin(n: int, testigos) -> bool:
+    """
+    Aplica Miller-Rabin a un impar n > 3 con las bases dadas.
+
+    Returns:
+        False si alguna base demuestra que n es compuesto
+    """
+    # Escribir n-1 como 2^r * d
+    r, d = 0, n - 1
+    while d % 2 == 0:
+        r += 1
+        d //= 2
+
+    for a in testigos:
+        a %= n
+        if a and _es_testigo_de_compuesto(a, n, d, r):
+            return False
+
+    return True
+
+
+def _parametro_selfridge(n: int) -> int:
+    """
+    Primer D de la sucesión 5, -7, 9, -11, ... con (D/n) = -1 (método A de Selfridge).
+    Retorna 0 si n es un cuadrado perfecto o tiene un factor común con algún D probado.
+    """
+    if es_cuadrado_perfecto(n):
+        return 0
+
+    d = 5
+    while True:
+        jacobi = simbolo_jacobi(d, n)
+        if jacobi == -1:
+            return d
+        if jacobi == 0 and abs(d) != n:
+            return 0
+        d = -d - 2 if d > 0 else -d + 2
+
+
+def _pasa_lucas_fuerte(n: int) -> bool:
+    """
+    Test de Lucas fuerte para un impar n > 3 con P = 1 y Q = (1 - D) / 4.
+
+    Con n + 1 = 2^s * d (d impar), n pasa si U_d ≡ 0 o V_(d·2^r) ≡ 0 (mod n)
+    para algún 0 ≤ r < s.
+
+    Returns:
+        False si la sucesión de Lucas demuestra que n es compuesto
+    """
+    D = _parametro_selfridge(n)
+    if D == 0:
+        return False
+    P, Q = 1, (1 - D) // 4
+    n = entero(n)
+
+    s, d = 0, n + 1
+    while d % 2 == 0:
+        s += 1
+        d //= 2
+
+    # Recorrer los bits de d de izquierda a derecha: duplicar k y, si el
+    # bit vale 1, avanzar a k + 1 (las divisiones por 2 son módulo n)
+    U, V, Q_k = 1, P, Q
+    for bit in bin(d)[3:]:
+        U, V = U * V % n, (V * V - 2 * Q_k) % n
+        Q_k = Q_k * Q_k % n
+        if bit == "1":
+            U, V = P * U + V, D * U + P * V
+            U = (U + n if U % 2 else U) // 2 % n
+            V = (V + n if V % 2 else V) // 2 % n
+            Q_k = Q_k * Q % n
+
+    if U == 0 or V == 0:
+        return True
+
+    for _ in range(s - 1):
+        V = (V * V - 2 * Q_k) % n
+        if V == 0:
+            return True
+        Q_k = Q_k * Q_k % n
+
+    return False
+
+
+@lru_cache(maxsize=1)
+def _mapa_impares_lote(limite: int) -> np.ndarray:
+    """Criba de impares de solo lectura reutilizada por es_primo_lote."""
+    mapa = _criba_impares(limite)
+    mapa.flags.writeable = False
+    return mapa
+
+
+def es_primo_lote(valores) -> np.ndarray:
+    """
+    Verifica la primalidad de muchos números a la vez.
+
+    Los valores hasta UMBRAL_LOTE_CRIBA se responden consultando una criba
+    en caché. Para el resto se descartan primero, de forma vectorizada, los
+    múltiplos de primos pequeños, y solo los sobrevivientes pasan por
+    Miller-Rabin determinista uno a uno.
+
+    Args:
+        valores: Arreglo de NumPy o iterable de enteros
+
+    Returns:
+        Máscara booleana de NumPy con la misma forma que valores
+
+    Raises:
+        TypeError: Si algún valor no es entero (flotantes, booleanos, etc.)
+    """
+    if isinstance(valores, np.ndarray):
+        arreglo = valores
+    else:
+        valores = list(valores)
+        if any(isinstance(v, (bool, np.bool_)) for v in valores):
+            raise TypeError("es_primo_lote solo acepta valores enteros")
+        arreglo = np.asarray(valores)
+        # NumPy convierte a float64 (perdiendo precisión) o uint64 las listas
+        # con enteros fuera de int64: se conservan como objetos de Python
+        if arreglo.dtype.kind in "fu":
+            arreglo = np.asarray(valores, dtype=object)
+
+    forma = arreglo.shape
+
+    if arreglo.dtype.kind == "O":
+        if not all(isinstance(v, (int, np.integer)) and not isinstance(v, (bool, np.bool_))
+                   for v in arreglo.ravel()):
+            raise TypeError("es_primo_lote solo acepta valores enteros")
+    elif arreglo.dtype.kind not in "iu":
+        raise TypeError(f"es_primo_lote solo acepta valores enteros, no {arreglo.dtype}")
+
+    # Enteros que no caben en int64: se verifican uno a uno
+    if arreglo.dtype.kind == "O" or (arreglo.dtype.kind == "u" and arreglo.size
+                                     and arreglo.max() > np.iinfo(np.int64).max):
+        resultado = [es_primo_basico(int(v)) for v in arreglo.ravel()]
+        return np.array(resultado, dtype=bool).reshape(forma)
+
+    arreglo = arreglo.astype(np.int64).ravel()
+    resultado = np.zeros(arreglo.size, dtype=bool)
+
+    # Valores pequeños: consulta directa a la criba
+    pequenos = np.flatnonzero((arreglo >= 2) & (arreglo <= UMBRAL_LOTE_CRIBA))
+    if pequenos.size:
+        v = arreglo[pequenos]
+        # La criba se redondea a potencias de 2 para reutilizarla entre llamadas
+        limite = min(1 << int(v.max()).bit_length(), UMBRAL_LOTE_CRIBA) + 1
+        mapa = _mapa_impares_lote(limite)
+        resultado[pequenos] = (mapa[v >> 1] & (v & 1).astype(bool)) | (v == 2)
+
+    # Valores grandes: filtro vectorizado con primos pequeños y luego Miller-Rabin
+    grandes = np.flatnonzero(arreglo > UMBRAL_LOTE_CRIBA)
+    if grandes.size:
+        v = arreglo[grandes]
+        candidatos = np.ones(v.size, dtype=bool)
+        for p in _primos_pequenos():
+            candidatos &= v % p != 0
+
+        for i in grandes[candidatos].tolist():
+            n = int(arreglo[i])
+            resultado[i] = _pasa_miller_rabin(n, _testigos_fijos(n))
+
+    return resultado.reshape(forma)
+
+
+# ==================== GENERACIÓN DE PRIMOS ====================
+
+def _criba_impares(limite: int) -> np.ndarray:
+    """
+    Criba de Eratóstenes que solo almacena los números impares.
+
+    La posición i del arreglo representa al número 2i + 1, y cada entrada
+    ocupa un byte. Los múltiplos se tachan con asignación por rebanadas
+    (slicing con paso), sin bucles internos en Python.
+
+    Args:
+        limite: Número máximo a cribar (se asume limite >= 1)
+
+    Returns:
+        Arreglo booleano de NumPy con (limite + 1) // 2 posiciones
+    """
+    es_primo = np.ones((limite + 1) // 2, dtype=bool)
+    es_primo[0] = False  # el 1 no es primo
+
+    for i in range(1, (math.isqrt(limite) - 1) // 2 + 1):
+        if es_primo[i]:
+            p = 2 * i + 1
+            es_primo[p * p // 2::p] = False
+
+    return es_primo
+
+
+def _primos_desde_impares(es_primo: np.ndarray, base: int = 1) -> np.ndarray:
+    """
+    Convierte una máscara de impares en el arreglo de primos que representa.
+
+    Args:
+        es_primo: Máscara donde la posición i representa a base + 2i
+        base: Número impar representado por la posición 0
+
+    Returns:
+        Arreglo de NumPy (int64) con los primos marcados
+    """
+    return base + 2 * np.flatnonzero(es_primo).astype(np.int64)
+
+
+def criba_eratostenes_array(limite: int) -> np.ndarray:
+    """
+    Criba de Eratóstenes que retorna los primos como arreglo de NumPy.
+    Útil para cálculos vectorizados sobre muchos primos.
+
+    Args:
+        limite: Número máximo hasta el cual buscar primos
+
+    Returns:
+        Arreglo de NumPy (int64) con los primos hasta el límite
+    """
+    if limite < 2:
+        return np.zeros(0, dtype=np.int64)
+
+    impares = _primos_desde_impares(_criba_impares(limite))
+    return np.concatenate((np.array([2], dtype=np.int64), impares))
+
+
+def criba_eratostenes(limite: int) -> List[int]:
+    """
+    Implementa la Criba de Eratóstenes para generar primos hasta un límite.
+
+    Args:
+        limite: Número máximo hasta el cual buscar primos
+
+    Returns:
+        Lista de números primos hasta el límite
+    """
+    return criba_eratostenes_array(limite).tolist()
+
+
+class TrazaCriba:
+    """
+    Traza compacta de la Criba de Eratóstenes para animarla.
+
+    En lugar de copiar el estado completo en cada paso, guarda solo los
+    índices que cada paso marca como compuestos (todos en un único arreglo,
+    con la posición donde empieza cada paso) y, cada cierta cantidad de
+    pasos, un punto de control con el estado empaquetado en bits. Cualquier
+    cuadro se reconstruye partiendo del punto de control anterior.
+
+    El cuadro 0 es el estado inicial y el cuadro k el estado tras el paso k.
+    """
+
+    def __init__(self, limite: int, intervalo_control: int = 8):
+        """
+        Args:
+            limite: Número máximo hasta el cual ejecutar la criba
+            intervalo_control: Cada cuántos pasos se guarda un punto de control
+        """
+        self.limite = limite
+        self.intervalo_control = intervalo_control
+
+        es_primo = np.ones(limite + 1, dtype=bool)
+        es_primo[:2] = False
+        tipo = np.int32 if limite < 2**31 else np.int64
+
+        numeros = []
+        marcados = []
+        self._puntos_control = [np.packbits(es_primo)]
+
+        for i in range(2, math.isqrt(limite) + 1):
+            if not es_primo[i]:
+                continue
+            multiplos = np.arange(i * i, limite + 1, i, dtype=tipo)
+            nuevos = multiplos[es_primo[multiplos]]
+            if not nuevos.size:
+                continue
+
+            es_primo[nuevos] = False
+            numeros.append(i)
+            marcados.append(nuevos)
+            if len(numeros) % intervalo_control == 0:
+                self._puntos_control.append(np.packbits(es_primo))
+
+        self.numeros = np.array(numeros, dtype=np.int64)
+        self.marcados = np.concatenate(marcados) if marcados else np.zeros(0, dtype=tipo)
+        self.inicios = np.concatenate(([0], np.cumsum([len(m) for m in marcados], dtype=np.int64)))
+
+    def __len__(self) -> int:
+        """Cantidad de cuadros (pasos + estado inicial)."""
+        return len(self.numeros) + 1
+
+    def marcados_en(self, k: int) -> np.ndarray:
+        """Índices marcados como compuestos en el paso k (k ≥ 1)."""
+        return self.marcados[self.inicios[k - 1]:self.inicios[k]]
+
+    def estado(self, k: int) -> np.ndarray:
+        """
+        Reconstruye el cuadro k.
+
+        Args:
+            k: Número de cuadro (0 = inicial; negativos cuentan desde el final)
+
+        Returns:
+            Máscara booleana donde la posición i indica si i sigue sin marcar
+        """
+        if k < 0:
+            k += len(self)
+        if not 0 <= k < len(self):
+            raise IndexError("Cuadro fuera de la traza")
+
+        punto = k // self.intervalo_control
+        es_primo = np.unpackbits(self._puntos_control[punto], count=self.limite + 1).astype(bool)
+        es_primo[self.marcados[self.inicios[punto * self.intervalo_control]:self.inicios[k]]] = False
+        return es_primo
+
+    def __getitem__(self, k: int) -> Dict:
+        """Cuadro k como diccionario: numero_actual, accion, marcados y estado."""
+        es_primo = self.estado(k)
+        if k < 0:
+            k += len(self)
+        if k == 0:
+            return {"numero_actual": 2, "accion": "inicio",
+                    "marcados": self.marcados[:0], "estado": es_primo}
+        return {"numero_actual": int(self.numeros[k - 1]), "accion": "marcar_multiplos",
+                "marcados": self.marcados_en(k), "estado": es_primo}
+
+    def reproducir(self, desde: int = 0) -> Iterator[Dict]:
+        """
+        Recorre los cuadros en orden aplicando un paso por vez, sin
+        reconstruir cada cuadro desde su punto de control.
+
+        Args:
+            desde: Primer cuadro a producir
+
+        Yields:
+            Diccionarios como los de traza[k]; el estado se reutiliza entre
+            cuadros, así que hay que copiarlo si se quiere conservar
+        """
+        if desde >= len(self):
+            return
+        cuadro = self[desde]
+        yield cuadro
+        es_primo = cuadro["estado"]
+
+        for k in range(desde + 1, len(self)):
+            marcados = self.marcados_en(k)
+            es_primo[marcados] = False
+            yield {"numero_actual": int(self.numeros[k - 1]), "accion": "marcar_multiplos",
+                   "marcados": marcados, "estado": es_primo}
+
+    def __iter__(self) -> Iterator[Dict]:
+        return self.reproducir()
+
+
+def criba_eratostenes_pasos(limite: int) -> TrazaCriba:
+    """
+    Genera los pasos de la Criba de Eratóstenes para animación.
+
+    Args:
+        limite: Número máximo hasta el cual ejecutar la criba
+
+    Returns:
+        TrazaCriba con un cuadro por paso; traza[k] retorna el diccionario
+        con el estado en el paso k
+    """
+    return TrazaCriba(max(limite, 1))
+
+
+def generar_primos_hasta(limite: int) -> List[int]:
+    """
+    Genera lista de números primos hasta un límite.
+    Alias para criba_eratostenes.
+
+    Args:
+        limite: Número máximo
+
+    Returns:
+        Lista de primos
+    """
+    return criba_eratostenes(limite)
+
+
+def _segmento_impares(bajo: int, alto: int, primos_base: np.ndarray) -> np.ndarray:
+    """
+    Criba los números impares del intervalo [bajo, alto].
+
+    Los primos base con muchos múltiplos en el segmento se tachan con
+    rebanadas; los que tienen pocos se tachan todos a la vez, avanzando en
+    paralelo el siguiente múltiplo de cada uno.
+
+    Args:
+        bajo: Extremo inferior del segmento
+        alto: Extremo superior del segmento
+        primos_base: Arreglo (int64) de primos impares hasta al menos √alto, en orden
+
+    Returns:
+        Máscara booleana donde la posición i representa a (bajo | 1) + 2i
+    """
+    primero_impar = bajo | 1
+    if alto < primero_impar:
+        return np.zeros(0, dtype=bool)
+
+    longitud = (alto - primero_impar) // 2 + 1
+    es_primo = np.ones(longitud, dtype=bool)
+    if primero_impar == 1:
+        es_primo[0] = False
+
+    primos = primos_base[:np.searchsorted(primos_base, math.isqrt(alto), side="right")]
+
+    # Primer múltiplo impar de cada p dentro del segmento (sin tachar al propio p)
+    multiplos = np.maximum(primos * primos, (primero_impar + primos - 1) // primos * primos)
+    multiplos += primos * (multiplos % 2 == 0)
+    posiciones = (multiplos - primero_impar) // 2
+
+    # Primos con muchos múltiplos en el segmento: una rebanada por primo
+    corte = np.searchsorted(primos, longitud // 32)
+    for p, posicion in zip(primos[:corte].tolist(), posiciones[:corte].tolist()):
+        es_primo[posicion::p] = False
+
+    # Primos con pocos múltiplos: todos a la vez, un múltiplo por vuelta
+    primos = primos[corte:]
+    posiciones = posiciones[corte:]
+    while posiciones.size:
+        dentro = posiciones < longitud
+        primos = primos[dentro]
+        posiciones = posiciones[dentro]
+        es_primo[posiciones] = False
+        posiciones += primos
+
+    return es_primo
+
+
+def criba_segmentada(inicio: int, fin: int,
+                     tamano_bloque: int = TAMANO_BLOQUE_CRIBA) -> Iterator[np.ndarray]:
+    """
+    Criba de Eratóstenes segmentada sobre el intervalo [inicio, fin].
+
+    Solo se criban los números de la ventana pedida, en bloques de tamaño
+    fijo, usando los primos base hasta √fin. La memoria usada depende de
+    √fin más el tamaño del bloque, no de fin.
+
+    Args:
+        inicio: Número inicial del rango
+        fin: Número final del rango
+        tamano_bloque: Cantidad de números cribados por bloque
+
+    Yields:
+        Arreglos de NumPy (int64) con los primos de cada bloque, en orden
+    """
+    inicio = max(inicio, 2)
+    if fin < inicio:
+        return
+
+    primos_base = criba_eratostenes_array(math.isqrt(fin))[1:]
+
+    for bajo in range(inicio, fin + 1, tamano_bloque):
+        alto = min(bajo + tamano_bloque - 1, fin)
+        yield _primos_de_segmento(bajo, alto, primos_base)
+
+
+def _primos_de_segmento(bajo: int, alto: int, primos_base: np.ndarray) -> np.ndarray:
+    """Primos del segmento [bajo, alto], con bajo >= 2, incluyendo el 2 si corresponde."""
+    primos = _primos_desde_impares(_segmento_impares(bajo, alto, primos_base), bajo | 1)
+
+    if bajo == 2:
+        primos = np.concatenate((np.array([2], dtype=np.int64), primos))
+
+    return primos
+
+
+def iterar_bloques_primos(desde: int = 2,
+                          tamano_bloque: int = TAMANO_BLOQUE_CRIBA) -> Iterator[np.ndarray]:
+    """
+    Criba segmentada incremental y sin límite superior.
+
+    Los primos base se amplían a medida que √alto crece, así que la memoria
+    solo depende de √(número alcanzado) más el tamaño del bloque.
+
+    Args:
+        desde: Número a partir del cual (inclusive) se buscan primos
+        tamano_bloque: Cantidad de números cribados por bloque
+
+    Yields:
+        Arreglos de NumPy (int64) con los primos de cada bloque, sin fin
+    """
+    bajo = max(desde, 2)
+    limite_base = math.isqrt(bajo + tamano_bloque)
+    primos_base = criba_eratostenes_array(limite_base)[1:]
+
+    while True:
+        alto = bajo + tamano_bloque - 1
+
+        if math.isqrt(alto) > limite_base:
+            nuevo_limite = max(2 * limite_base, math.isqrt(alto))
+            nuevos = _primos_en_ventana(limite_base + 1, nuevo_limite)
+            primos_base = np.concatenate((primos_base, nuevos))
+            limite_base = nuevo_limite
+
+        yield _primos_de_segmento(bajo, alto, primos_base)
+        bajo = alto + 1
+
+
+def iterar_primos(desde: int = 2) -> Iterator[int]:
+    """
+    Generador perezoso de todos los primos a partir de un número.
+
+    Args:
+        desde: Número a partir del cual (inclusive) se buscan primos
+
+    Yields:
+        Primos en orden creciente, sin fin
+    """
+    for bloque in iterar_bloques_primos(desde):
+        yield from bloque.tolist()
+
+
+def bloques_de_primos(cantidad: int, desde: int = 2) -> Iterator[List[int]]:
+    """
+    Entrega los primos en lotes de tamaño fijo, como islice aplicado
+    repetidamente sobre iterar_primos.
+
+    Args:
+        cantidad: Cantidad de primos por lote
+        desde: Número a partir del cual (inclusive) se buscan primos
+
+    Yields:
+        Listas con cantidad primos consecutivos cada una
+    """
+    primos = iterar_primos(desde)
+    while True:
+        yield list(islice(primos, cantidad))
+
+
+def tomar_primos(cantidad: int, desde: int = 2) -> List[int]:
+    """
+    Obtiene los primeros primos a partir de un número sin fijar un límite.
+
+    Args:
+        cantidad: Cuántos primos obtener
+        desde: Número a partir del cual (inclusive) se buscan primos
+
+    Returns:
+        Lista con cantidad primos consecutivos
+    """
+    return list(islice(iterar_primos(desde), cantidad))
+
+
+def primos_en_rango(inicio: int, fin: int, workers: int = None) -> List[int]:
+    """
+    Encuentra todos los primos en un rango específico.
+    Usa la criba segmentada, por lo que no necesita cribar desde 0.
+
+    Args:
+        inicio: Número inicial del rango
+        fin: Número final del rango
+        workers: Si es mayor que 1, criba en paralelo con esa cantidad de procesos
+
+    Returns:
+        Lista de primos en el rango [inicio, fin]
+    """
+    if fin < 2:
+        return []
+    if _base_cubre(fin):
+        return _base_primos.primos_en_rango(inicio, fin).tolist()
+    if workers is not None and workers > 1:
+        return criba_paralela(inicio, fin, "primos", workers).tolist()
+
+    primos = []
+    for bloque in criba_segmentada(inicio, fin):
+        primos.extend(bloque.tolist())
+    return primos
+
+
+def _primos_en_ventana(bajo: int, alto: int) -> np.ndarray:
+    """Primos del intervalo [bajo, alto] como un solo arreglo de NumPy."""
+    bloques = list(criba_segmentada(bajo, alto))
+    if not bloques:
+        return np.zeros(0, dtype=np.int64)
+    return np.concatenate(bloques)
+
+
+def _integral_logaritmica(x: float) -> float:
+    """
+    Integral logarítmica li(x) mediante la serie de Ramanujan (x > 1).
+    """
+    ln_x = math.log(x)
+    suma = 0.0
+    termino = 1.0
+    suma_interna = 0.0
+
+    for n in range(1, 200):
+        # termino = (ln x)^n / (n! 2^(n-1))
+        termino *= ln_x / n
+        if n > 1:
+            termino /= 2
+        if (n - 1) % 2 == 0:
+            suma_interna += 1 / n
+        aporte = (-1) ** (n - 1) * termino * suma_interna
+        suma += aporte
+        if abs(aporte) < 1e-12 * abs(suma):
+            break
+
+    return 0.5772156649015329 + math.log(ln_x) + math.sqrt(x) * suma
+
+
+def _estimar_enesimo_primo(n: int) -> int:
+    """
+    Estima p_n invirtiendo li(x) ≈ π(x) con el método de Newton,
+    partiendo de la aproximación de Cipolla
+    p_n ≈ n (ln n + ln ln n - 1 + (ln ln n - 2) / ln n).
+    """
+    ln_n = math.log(n)
+    ln_ln_n = math.log(ln_n)
+    x = n * (ln_n + ln_ln_n - 1 + (ln_ln_n - 2) / ln_n)
+
+    for _ in range(10):
+        correccion = (_integral_logaritmica(x) - n) * math.log(x)
+        x -= correccion
+        if abs(correccion) < 1:
+            break
+
+    return int(x)
+
+
+def enesimo_primo(n: int) -> int:
+    """
+    Encuentra el n-ésimo número primo.
+
+    Para n pequeño se consulta la tabla compartida de primos.
+    Para n grande estima p_n analíticamente, calcula π en la estimación con
+    el método sublineal y criba solo una ventana corta alrededor de ella
+    para recorrer los primos que faltan o sobran.
+
+    Args:
+        n: Posición del primo buscado (1 = primer primo = 2)
+
+    Returns:
+        El n-ésimo número primo
+    """
+    if n < 1:
+        return None
+
+    if n < UMBRAL_CONTEO_SUBLINEAL:
+        return tabla_primos_compartida().enesimo(n)
+    if _base_primos is not None and n <= _base_primos.total_primos:
+        return _base_primos.enesimo(n)
+
+    x = _estimar_enesimo_primo(n)
+    diferencia = n - contar_primos_hasta(x)
+
+    # Ancho inicial: la separación media entre primos cerca de x es ln x
+    ancho = max(int((abs(diferencia) + 1) * math.log(x) * 1.5), 1000)
+
+    if diferencia > 0:
+        # Faltan primos: avanzar desde x + 1
+        bajo = x + 1
+        while True:
+            primos = _primos_en_ventana(bajo, bajo + ancho - 1)
+            if len(primos) >= diferencia:
+                return int(primos[diferencia - 1])
+            diferencia -= len(primos)
+            bajo += ancho
+            ancho *= 2
+    else:
+        # Sobran primos: el buscado es el (1 - diferencia)-ésimo contando desde x hacia atrás
+        sobran = 1 - diferencia
+        alto = x
+        while True:
+            primos = _primos_en_ventana(max(alto - ancho + 1, 2), alto)
+            if len(primos) >= sobran:
+                return int(primos[-sobran])
+            sobran -= len(primos)
+            alto -= ancho
+            ancho *= 2
+
+
+def primos_desde_posicion(posicion: int, cantidad: int) -> List[int]:
+    """
+    Obtiene los primos que ocupan las posiciones posicion, posicion + 1, ...
+    Solo criba a partir del primo inicial, así que la memoria depende de
+    cantidad y no de la posición.
+
+    Args:
+        posicion: Posición del primer primo (1 = primer primo = 2)
+        cantidad: Cuántos primos consecutivos obtener
+
+    Returns:
+        Lista con cantidad primos consecutivos
+    """
+    if posicion < 1 or cantidad < 1:
+        return []
+
+    return tomar_primos(cantidad, desde=enesimo_primo(posicion))
+
+
+def _tabla_para_consulta(n: int):
+    """
+    Tabla compartida si conviene usarla para una consulta puntual sobre n.
+
+    Solo se usa si n está dentro de FACTOR_EXTENSION_TABLA veces su límite
+    actual, para que una sola consulta no la haga cribar hasta 10^8; más
+    arriba es mucho más barato cribar una ventana alrededor de n.
+
+    Returns:
+        La tabla, o None si hay que usar _primo_cercano_por_ventanas
+    """
+    tabla = tabla_primos_compartida()
+    alcance = FACTOR_EXTENSION_TABLA * max(tabla.limite, LIMITE_CRIBA_VENTANA)
+    if n < min(alcance, tabla.limite_maximo):
+        return tabla
+    return None
+
+
+def siguiente_primo(n: int) -> int:
+    """
+    Encuentra el siguiente número primo después de n.
+
+    Args:
+        n: Número de referencia
+
+    Returns:
+        Siguiente primo después de n
+    """
+    if _base_cubre(n):
+        primo = _base_primos.siguiente(n)
+        if primo is not None:
+            return primo
+
+    tabla = _tabla_para_consulta(n)
+    if tabla is not None:
+        primo = tabla.siguiente(n)
+        if primo is not None:
+            return primo
+
+    return _primo_cercano_por_ventanas(n, arriba=True, abajo=False)
+
+
+def primo_anterior(n: int) -> int:
+    """
+    Encuentra el número primo anterior a n.
+
+    Args:
+        n: Número de referencia
+
+    Returns:
+        Primo anterior a n, o None si no existe
+    """
+    if n <= 2:
+        return None
+
+    if _base_cubre(n - 1):
+        return _base_primos.anterior(n)
+
+    tabla = _tabla_para_consulta(n)
+    if tabla is not None:
+        return tabla.anterior(n)
+
+    return _primo_cercano_por_ventanas(n, arriba=False, abajo=True)
+
+
+def primo_mas_cercano(n: int) -> int:
+    """
+    Encuentra el primo más cercano a n (n mismo si es primo).
+    En caso de empate se prefiere el siguiente.
+
+    Args:
+        n: Número de referencia
+
+    Returns:
+        Primo más cercano a n
+    """
+    if n <= 2:
+        return 2
+
+    if _base_cubre(n):
+        if _base_primos.es_primo(n):
+            return n
+        sig = _base_primos.siguiente(n)
+        if sig is not None:
+            ant = _base_primos.anterior(n)
+            return sig if sig - n <= n - ant else ant
+
+    tabla = _tabla_para_consulta(n)
+    if tabla is not None:
+        cercano = tabla.mas_cercano(n)
+        if cercano is not None:
+            return cercano
+    if es_primo_basico(n):
+        return n
+
+    return _primo_cercano_por_ventanas(n, arriba=True, abajo=True)
+
+
+@lru_cache(maxsize=None)
+def _primos_criba_ventana() -> np.ndarray:
+    """Primos menores que LIMITE_CRIBA_VENTANA usados para cribar ventanas."""
+    return criba_eratostenes_array(LIMITE_CRIBA_VENTANA - 1)
+
+
+def _sobrevivientes_ventana(longitud: int, primos: np.ndarray, residuos: np.ndarray) -> np.ndarray:
+    """
+    Criba una ventana de longitud números consecutivos a partir de bajo.
+
+    Args:
+        longitud: Cantidad de números de la ventana
+        primos: Primos con los que se criba (todos menores que bajo)
+        residuos: bajo % p para cada primo p
+
+    Returns:
+        Desplazamientos (respecto de bajo) que no son múltiplos de ningún primo
+    """
+    libre = np.ones(longitud, dtype=bool)
+    posiciones = (-residuos) % primos
+
+    # Los primos menores que la ventana pueden tener varios múltiplos en ella
+    corte = int(np.searchsorted(primos, longitud))
+    for p, posicion in zip(primos[:corte].tolist(), posiciones[:corte].tolist()):
+        libre[posicion::p] = False
+
+    # El resto tiene a lo sumo un múltiplo: se tachan todos a la vez
+    posiciones = posiciones[corte:]
+    libre[posiciones[posiciones < longitud]] = False
+
+    return np.flatnonzero(libre)
+
+
+def _primo_cercano_por_ventanas(n: int, arriba: bool, abajo: bool) -> int:
+    """
+    Busca el primo más cercano a n (sin contar a n) hacia arriba, hacia
+    abajo o en ambos sentidos, para n mucho mayor que LIMITE_CRIBA_VENTANA.
+
+    Los restos de n módulo cada primo pequeño se calculan una sola vez; con
+    ellos se criba de forma vectorizada una ventana de distancias alrededor
+    de n y solo los sobrevivientes pasan por el test determinista, del más
+    cercano al más lejano. Si la ventana no tiene primos, se duplica su ancho
+    y se criban solo las distancias nuevas.
+
+    Returns:
+        El primo encontrado (en empate, el mayor)
+    """
+    primos = _primos_criba_ventana()
+    residuos_n = np.array([n % p for p in primos.tolist()], dtype=np.int64)
+
+    probada = 0  # distancias ya revisadas sin encontrar primo
+    ancho = max(2 * n.bit_length(), 64)
+
+    while True:
+        longitud = ancho - probada
+        candidatos = []
+        if arriba:
+            # Números n + probada + 1, ..., n + ancho
+            bajo = n + probada + 1
+            desplazamientos = _sobrevivientes_ventana(longitud, primos, (residuos_n + probada + 1) % primos)
+            candidatos.extend(bajo + d for d in desplazamientos.tolist())
+        if abajo:
+            # Números n - ancho, ..., n - probada - 1
+            bajo = n - ancho
+            desplazamientos = _sobrevivientes_ventana(longitud, primos, (residuos_n - ancho) % primos)
+            candidatos.extend(bajo + d for d in desplazamientos.tolist())
+
+        # Del más cercano al más lejano; en empate, primero el mayor
+        candidatos.sort(key=lambda c: (abs(c - n), c < n))
+        for candidato in candidatos:
+            if _pasa_test_determinista(candidato):
+                return candidato
+
+        probada = ancho
+        ancho *= 2
+
+
+# ==================== TABLA COMPARTIDA DE PRIMOS ====================
+
+class TablaPrimos:
+    """
+    Arreglo ordenado y compacto (uint32) de todos los primos hasta un límite
+    que crece bajo demanda.
+
+    Cuando una consulta pasa del final de la tabla, solo se criba el tramo
+    nuevo (duplicando el límite) y se agrega al final. Las consultas de
+    siguiente, anterior, más cercano y posición se responden con búsqueda
+    binaria sobre el arreglo.
+    """
+
+    def __init__(self, limite_inicial: int = 1 << 16,
+                 limite_maximo: int = LIMITE_TABLA_PRIMOS):
+        """
+        Args:
+            limite_inicial: Límite hasta el cual se criba al crear la tabla
+            limite_maximo: Mayor número que la tabla puede llegar a cubrir
+        """
+        self.limite_maximo = limite_maximo
+        self._candado = threading.Lock()
+        self._limite = min(limite_inicial, limite_maximo)
+        self._primos = self._congelar(criba_eratostenes_array(self._limite))
+
+    @staticmethod
+    def _congelar(primos: np.ndarray) -> np.ndarray:
+        """Convierte a uint32 de solo lectura para compartirlo sin copias."""
+        primos = primos.astype(np.uint32)
+        primos.flags.writeable = False
+        return primos
+
+    @property
+    def limite(self) -> int:
+        """Mayor número cubierto actualmente por la tabla."""
+        return self._limite
+
+    @property
+    def primos(self) -> np.ndarray:
+        """Arreglo de solo lectura con los primos hasta limite."""
+        return self._primos
+
+    def __len__(self) -> int:
+        return len(self._primos)
+
+    def _buscar(self, primos: np.ndarray, n: int, lado: str = "left") -> int:
+        """Búsqueda binaria de n (0 <= n < 2^32) sin convertir el arreglo de tipo."""
+        return int(np.searchsorted(primos, np.uint32(n), side=lado))
+
+    def _verificar_alcance(self, n: int) -> None:
+        if n > self.limite_maximo:
+            raise ValueError(f"{n} excede el alcance de la tabla ({self.limite_maximo})")
+
+    def extender(self, n: int) -> bool:
+        """
+        Asegura que la tabla cubra hasta n, cribando solo el tramo nuevo.
+        El límite al menos se duplica en cada extensión.
+
+        Args:
+            n: Número que se quiere cubrir
+
+        Returns:
+            True si la tabla cubre n (falso solo si n > limite_maximo)
+        """
+        if n > self._limite and self._limite < self.limite_maximo:
+            with self._candado:
+                if n > self._limite:
+                    nuevo = min(max(n, 2 * self._limite), self.limite_maximo)
+                    tramo = _primos_en_ventana(self._limite + 1, nuevo)
+                    # Publicar primero el arreglo y luego el límite que cubre
+                    self._primos = self._congelar(np.concatenate((self._primos, tramo)))
+                    self._limite = nuevo
+
+        return n <= self._limite
+
+    def contiene(self, n: int) -> bool:
+        """Indica si n es primo."""
+        if n < 2:
+            return False
+        self._verificar_alcance(n)
+        self.extender(n)
+        primos = self._primos
+        i = self._buscar(primos, n)
+        return i < len(primos) and int(primos[i]) == n
+
+    def contar_hasta(self, n: int) -> int:
+        """Cantidad de primos ≤ n, es decir π(n)."""
+        if n < 2:
+            return 0
+        self._verificar_alcance(n)
+        self.extender(n)
+        return self._buscar(self._primos, n, "right")
+
+    def indice(self, p: int) -> int:
+        """Posición de p en la sucesión de primos (1 para el 2), o None si p no es primo."""
+        return self.contar_hasta(p) if self.contiene(p) else None
+
+    def enesimo(self, k: int) -> int:
+        """El k-ésimo primo (1 = 2), o None si excede el alcance de la tabla."""
+        if k < 1:
+            return None
+        while len(self._primos) < k:
+            if self._limite >= self.limite_maximo:
+                return None
+            self.extender(2 * self._limite)
+        return int(self._primos[k - 1])
+
+    def siguiente(self, n: int) -> int:
+        """Menor primo mayor que n, o None si excede el alcance de la tabla."""
+        self.extender(min(max(n + 1, 2), self.limite_maximo))
+        while True:
+            primos = self._primos
+            i = self._buscar(primos, max(n, 1), "right")
+            if i < len(primos):
+                return int(primos[i])
+            if self._limite >= self.limite_maximo:
+                return None
+            self.extender(2 * self._limite)
+
+    def anterior(self, n: int) -> int:
+        """Mayor primo menor que n, o None si no existe."""
+        if n <= 2:
+            return None
+        self._verificar_alcance(n - 1)
+        self.extender(n - 1)
+        primos = self._primos
+        return int(primos[self._buscar(primos, n) - 1])
+
+    def mas_cercano(self, n: int) -> int:
+        """
+        Primo más cercano a n. En caso de empate se prefiere el siguiente.
+        Retorna None si el siguiente primo excede el alcance de la tabla.
+        """
+        if n <= 2:
+            return 2
+        if self.contiene(n):
+            return n
+        sig = self.siguiente(n)
+        if sig is None:
+            return None
+        ant = self.anterior(n)
+        return sig if sig - n <= n - ant else ant
+
+
+@lru_cache(maxsize=None)
+def tabla_primos_compartida() -> TablaPrimos:
+    """Instancia única de TablaPrimos compartida por las funciones del módulo."""
+    return TablaPrimos()
+
+
+# ==================== BASE DE PRIMOS EN DISCO ====================
+
+# Base de primos precalculada (ver utils.prime_storage) que, si está
+# registrada, responden primero las funciones del módulo
+_base_primos = None
+
+
+def usar_base_primos(base) -> None:
+    """
+    Registra una base de primos en disco para acelerar las consultas.
+
+    Mientras esté registrada, es_primo_basico, contar_primos_hasta,
+    enesimo_primo, siguiente_primo, primo_anterior, primo_mas_cercano y
+    primos_en_rango la consultan antes que la tabla compartida para los
+    números que cubre.
+
+    Args:
+        base: Objeto BasePrimos abierto, o None para dejar de usarla
+    """
+    global _base_primos
+    _base_primos = base
+
+
+def _base_cubre(n: int) -> bool:
+    """Indica si hay una base de primos registrada que llega hasta n."""
+    return _base_primos is not None and n <= _base_primos.limite
+
+
+# ==================== CRIBA PARALELA ====================
+
+# Primos base de cada proceso trabajador (se envían una sola vez al iniciarlo)
+_primos_base_trabajador = None
+
+
+def _iniciar_trabajador(primos_base: np.ndarray) -> None:
+    """Inicializador del proceso trabajador: guarda los primos base compartidos."""
+    global _primos_base_trabajador
+    _primos_base_trabajador = primos_base
+
+
+def _cribar_tramo(bajo: int, alto: int, resultado: str, patron: Tuple[int, ...] = None):
+    """
+    Criba el tramo [bajo, alto] (bajo >= 2) en bloques, dentro de un proceso
+    trabajador, y resume el resultado según lo pedido.
+    """
+    primos_base = _primos_base_trabajador
+    partes = []
+    conteo = 0
+
+    for b in range(bajo, alto + 1, TAMANO_BLOQUE_CRIBA):
+        e = min(b + TAMANO_BLOQUE_CRIBA - 1, alto)
+
+        if resultado == "conteo":
+            conteo += int(np.count_nonzero(_segmento_impares(b, e, primos_base)))
+            conteo += b <= 2 <= e
+        elif resultado == "mapa":
+            partes.append(_segmento_impares(b, e, primos_base))
+        elif resultado == "constelacion":
+            partes.append(_constelaciones_de_segmento(b, e, patron, primos_base))
+        elif resultado == "conteo_constelacion":
+            conteo += len(_constelaciones_de_segmento(b, e, patron, primos_base))
+        else:
+            partes.append(_primos_de_segmento(b, e, primos_base))
+
+    if resultado in ("conteo", "conteo_constelacion"):
+        return conteo
+    if resultado == "mapa":
+        return np.concatenate(partes) if partes else np.zeros(0, dtype=bool)
+
+    # Las listas de primos viajan al proceso principal codificadas (≈ 1 byte por primo)
+    return codificar_primos(np.concatenate(partes) if partes else [])
+
+
+def criba_paralela(inicio: int, fin: int, resultado: str = "primos",
+                   workers: int = None, patron=None):
+    """
+    Criba segmentada de [inicio, fin] repartida entre varios procesos.
+
+    El intervalo se divide en tramos que se criban en un ProcessPoolExecutor;
+    los primos base hasta √fin se calculan una vez y se envían a cada
+    proceso al iniciarlo. Los resultados de los tramos se unen en orden.
+
+    Args:
+        inicio: Número inicial del rango
+        fin: Número final del rango
+        resultado: Qué se quiere obtener:
+            - "primos": arreglo de NumPy con los primos del rango
+            - "conteo": cantidad de primos del rango
+            - "mapa": máscara de impares, la posición i representa a (max(inicio, 2) | 1) + 2i
+            - "constelacion": arreglo con el primer primo de cada aparición de patron
+              (con todos sus primos dentro del rango)
+            - "conteo_constelacion": cantidad de apariciones de patron
+            - "gemelos": igual que "constelacion" con el patrón de los primos gemelos
+        workers: Cantidad de procesos (por defecto, uno por núcleo)
+        patron: Nombre de CONSTELACIONES o tupla de desplazamientos (solo para constelaciones)
+
+    Returns:
+        Entero si resultado es un conteo; arreglo de NumPy en otro caso
+    """
+    if resultado == "gemelos":
+        resultado, patron = "constelacion", "gemelos"
+    if resultado not in ("primos", "conteo", "mapa", "constelacion", "conteo_constelacion"):
+        raise ValueError(f"Resultado desconocido: {resultado}")
+
+    es_conteo = resultado in ("conteo", "conteo_constelacion")
+    ancho = 0
+    inicio = max(inicio, 2)
+    if resultado in ("constelacion", "conteo_constelacion"):
+        patron = _desplazamientos_patron(patron)
+        ancho = patron[-1]
+        fin -= ancho  # el último primo de cada aparición también debe estar en el rango
+    if fin < inicio:
+        return 0 if es_conteo else np.zeros(0, dtype=bool if resultado == "mapa" else np.int64)
+
+    workers = workers or os.cpu_count() or 1
+
+    # Varios tramos por proceso para equilibrar la carga; los cortes son
+    # pares para que las máscaras de impares de los tramos queden contiguas
+    tamano = max((fin - inicio + 1) // (4 * workers), TAMANO_BLOQUE_CRIBA)
+    tamano += tamano % 2
+    cortes = [inicio] + list(range((inicio // tamano + 1) * tamano, fin + 1, tamano))
+    bajos = cortes
+    altos = [c - 1 for c in cortes[1:]] + [fin]
+
+    primos_base = criba_eratostenes_array(math.isqrt(fin + ancho))[1:]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_iniciar_trabajador,
+                             initargs=(primos_base,)) as ejecutor:
+        partes = list(ejecutor.map(_cribar_tramo, bajos, altos, repeat(resultado),
+                                   repeat(patron)))
+
+    if es_conteo:
+        return sum(partes)
+    if resultado == "mapa":
+        return np.concatenate(partes)
+    return np.concatenate([decodificar_primos(parte) for parte in partes])
+
+
+# ==================== CONSTELACIONES DE PRIMOS ====================
+
+# Patrones de k-tuplas admisibles: desplazamientos de cada primo respecto del primero
+CONSTELACIONES = {
+    "gemelos": (0, 2),
+    "primos_primos": (0, 4),
+    "sexys": (0, 6),
+    "tripletes_a": (0, 2, 6),
+    "tripletes_b": (0, 4, 6),
+    "cuadrupletes": (0, 2, 6, 8),
+}
+
+
+def es_patron_admisible(patron) -> bool:
+    """
+    Indica si un patrón de desplazamientos es admisible: para ningún primo q
+    los desplazamientos cubren todas las clases módulo q. Solo los patrones
+    admisibles pueden aparecer infinitas veces.
+
+    Args:
+        patron: Tupla de desplazamientos (el primero es 0)
+
+    Returns:
+        True si el patrón es admisible
+    """
+    for q in criba_eratostenes(len(patron)):
+        if len({d % q for d in patron}) == q:
+            return False
+    return True
+
+
+def _desplazamientos_patron(patron) -> Tuple[int, ...]:
+    """Resuelve un nombre de CONSTELACIONES o valida una tupla de desplazamientos."""
+    if isinstance(patron, str):
+        if patron not in CONSTELACIONES:
+            raise ValueError(f"Constelación desconocida: {patron}")
+        return CONSTELACIONES[patron]
+
+    patron = tuple(int(d) for d in patron)
+    if len(patron) < 2 or patron[0] != 0 or any(b <= a for a, b in zip(patron, patron[1:])):
+        raise ValueError("El patrón debe empezar en 0 y ser estrictamente creciente")
+    if any(d % 2 for d in patron):
+        raise ValueError("Los desplazamientos del patrón deben ser pares")
+    if not es_patron_admisible(patron):
+        raise ValueError(f"El patrón {patron} no es admisible")
+    return patron
+
+
+def _constelaciones_de_segmento(bajo: int, alto: int, patron: Tuple[int, ...],
+                                primos_base: np.ndarray) -> np.ndarray:
+    """
+    Primeros primos p en [bajo, alto] tales que p + d es primo para cada
+    desplazamiento d del patrón.
+
+    Se criba el segmento extendido hasta alto + ancho del patrón y se hace
+    el AND de la máscara de impares desplazada d / 2 posiciones por cada d,
+    así que las apariciones que cruzan el borde del segmento no se pierden.
+    """
+    es_primo = _segmento_impares(bajo, alto + patron[-1], primos_base)
+    primero_impar = bajo | 1
+    cantidad = (alto - primero_impar) // 2 + 1 if alto >= primero_impar else 0
+
+    coincide = es_primo[:cantidad].copy()
+    for d in patron[1:]:
+        coincide &= es_primo[d // 2:d // 2 + cantidad]
+
+    return _primos_desde_impares(coincide, primero_impar)
+
+
+def iterar_constelaciones(patron, inicio: int, fin: int,
+                          tamano_bloque: int = TAMANO_BLOQUE_CRIBA) -> Iterator[np.ndarray]:
+    """
+    Busca las apariciones de una constelación en [inicio, fin] bloque a bloque,
+    sin generar la lista completa de primos.
+
+    Args:
+        patron: Nombre de CONSTELACIONES o tupla de desplazamientos (ej: (0, 2, 6))
+        inicio: Número inicial del rango
+        fin: Número final del rango (todos los primos de cada aparición deben ser ≤ fin)
+        tamano_bloque: Cantidad de números cribados por bloque
+
+    Yields:
+        Arreglos de NumPy (int64) con el primer primo de cada aparición, en orden
+    """
+    patron = _desplazamientos_patron(patron)
+    inicio = max(inicio, 3)
+    ultimo = fin - patron[-1]
+    if ultimo < inicio:
+        return
+
+    primos_base = criba_eratostenes_array(math.isqrt(fin))[1:]
+
+    for bajo in range(inicio, ultimo + 1, tamano_bloque):
+        alto = min(bajo + tamano_bloque - 1, ultimo)
+        yield _constelaciones_de_segmento(bajo, alto, patron, primos_base)
+
+
+def buscar_constelaciones(patron, inicio: int, fin: int,
+                          workers: int = None) -> List[Tuple[int, ...]]:
+    """
+    Lista las apariciones de una constelación de primos en un rango.
+
+    Args:
+        patron: Nombre de CONSTELACIONES o tupla de desplazamientos
+        inicio: Número inicial del rango
+        fin: Número final del rango
+        workers: Si es mayor que 1, criba en paralelo con esa cantidad de procesos
+
+    Returns:
+        Lista de tuplas (p, p + d2, ..., p + dk) con todos sus primos en [inicio, fin]
+    """
+    desplazamientos = _desplazamientos_patron(patron)
+
+    if workers is not None and workers > 1:
+        primeros = criba_paralela(inicio, fin, "constelacion", workers, desplazamientos)
+    else:
+        bloques = list(iterar_constelaciones(desplazamientos, inicio, fin))
+        primeros = np.concatenate(bloques) if bloques else np.zeros(0, dtype=np.int64)
+
+    return [tuple(p + d for d in desplazamientos) for p in primeros.tolist()]
+
+
+def contar_constelaciones(patron, inicio: int, fin: int, workers: int = None) -> int:
+    """
+    Cuenta las apariciones de una constelación de primos sin guardarlas.
+
+    Args:
+        patron: Nombre de CONSTELACIONES o tupla de desplazamientos
+        inicio: Número inicial del rango
+        fin: Número final del rango
+        workers: Si es mayor que 1, criba en paralelo con esa cantidad de procesos
+
+    Returns:
+        Cantidad de apariciones con todos sus primos en [inicio, fin]
     """
-    if numero <= 1:
-        return False
-    if numero <= 3:
-        return True
-    if numero % 2 == 0 or numero % 3 == 0:
-        return False
-
-    # Optimización: solo verificar divisores de la forma 6k ± 1
-    i = 5
-    while i * i <= numero:
-        if numero % i == 0 or numero % (i + 2) == 0:
-            return False
-        i += 6
+    if workers is not None and workers > 1:
+        return criba_paralela(inicio, fin, "conteo_constelacion", workers, patron)
 
-    return True
+    return sum(len(bloque) for bloque in iterar_constelaciones(patron, inicio, fin))
 
 
-def es_primo_con_pasos(numero: int) -> Tuple[bool, List[Dict]]:
+def es_parte_de_constelacion(n: int, patron) -> Tuple[int, ...]:
     """
-    Verifica si un número es primo y retorna los pasos del proceso.
+    Verifica si n pertenece a alguna aparición de una constelación.
+    Solo hace pruebas de primalidad sobre los k^2 candidatos posibles.
 
     Args:
-        numero: Número entero a verificar
+        n: Número a verificar
+        patron: Nombre de CONSTELACIONES o tupla de desplazamientos
 
     Returns:
-        Tupla (es_primo, lista_de_pasos)
-        Cada paso: {"divisor": int, "es_divisible": bool, "resto": int}
+        La tupla de primos que contiene a n, o None si no pertenece a ninguna
     """
-    pasos = []
+    patron = _desplazamientos_patron(patron)
+    if not es_primo_basico(n):
+        return None
 
-    if numero <= 1:
-        return False, pasos
-    if numero == 2:
-        return True, pasos
-    if numero % 2 == 0:
-        pasos.append({"divisor": 2, "es_divisible": True, "resto": 0})
-        return False, pasos
+    for d in patron:
+        primero = n - d
+        if primero < 3:
+            continue
+        tupla = tuple(primero + e for e in patron)
+        if all(es_primo_basico(p) for p in tupla):
+            return tupla
 
-    limite = int(numero**0.5) + 1
-    for i in range(2, min(limite, 100)):  # Limitar pasos para visualización
-        resto = numero % i
-        es_divisible = resto == 0
-        pasos.append({
-            "divisor": i,
-            "es_divisible": es_divisible,
-            "resto": resto
-        })
-        if es_divisible:
-            return False, pasos
+    return None
 
-    # Si el número es grande y no encontramos divisor en los primeros 100
-    if limite > 100:
-        es_primo = es_primo_basico(numero)
-        return es_primo, pasos
 
-    return True, pasos
+# ==================== PRIMOS ALEATORIOS Y RSA ====================
+
+# Hasta esta cantidad de bits los primos aleatorios se eligen de la tabla compartida
+BITS_PRIMO_ALEATORIO_TABLA = 20
 
 
-def es_primo_miller_rabin(n: int, k: int = 5) -> bool:
+def primo_aleatorio(bits: int, seguro: bool = False, generador: random.Random = None) -> int:
     """
-    Test de primalidad de Miller-Rabin (probabilístico).
-    Útil para números muy grandes.
+    Genera un primo aleatorio de exactamente bits bits.
+
+    Parte de un impar aleatorio y avanza por ventanas cribadas con los
+    primos pequeños; solo los sobrevivientes pasan por Baillie-PSW. Un primo
+    seguro p cumple además que (p - 1) / 2 también es primo.
 
     Args:
-        n: Número a verificar
-        k: Número de rondas (mayor k = mayor precisión)
+        bits: Cantidad de bits del primo (al menos 2; al menos 3 si es seguro)
+        seguro: Generar un primo seguro
+        generador: Fuente de aleatoriedad (por defecto random.SystemRandom)
 
     Returns:
-        True si probablemente es primo, False si definitivamente es compuesto
+        Primo p con 2^(bits-1) ≤ p < 2^bits
     """
-    if n < 2:
-        return False
-    if n == 2 or n == 3:
-        return True
-    if n % 2 == 0:
-        return False
-
-    # Escribir n-1 como 2^r * d
-    r, d = 0, n - 1
-    while d % 2 == 0:
-        r += 1
-        d //= 2
-
-    # Test de k rondas
-    for _ in range(k):
-        a = random.randrange(2, n - 1)
-        x = pow(a, d, n)
-
-        if x == 1 or x == n - 1:
-            continue
+    return _primo_aleatorio(bits, seguro, generador or random.SystemRandom(), bits_altos=1)
 
-        for _ in range(r - 1):
-            x = pow(x, 2, n)
-            if x == n - 1:
-                break
-        else:
-            return False
 
-    return True
+def _primo_aleatorio(bits: int, seguro: bool, generador: random.Random, bits_altos: int) -> int:
+    """
+    Primo aleatorio de bits bits con sus bits_altos bits más significativos en 1
+    (con dos bits altos, el producto de dos de ellos tiene exactamente 2·bits bits).
+    """
+    if bits < (3 if seguro else 2):
+        raise ValueError(f"No hay primos{' seguros' if seguro else ''} de {bits} bits")
 
+    if bits <= BITS_PRIMO_ALEATORIO_TABLA:
+        bajo = max(1 << (bits - 1), ((1 << bits_altos) - 1) << (bits - bits_altos))
+        candidatos = [p for p in primos_en_rango(bajo, (1 << bits) - 1)
+                      if not seguro or es_primo_basico((p - 1) // 2)]
+        if not candidatos:
+            return _primo_aleatorio(bits, seguro, generador, bits_altos - 1)
+        return generador.choice(candidatos)
 
-# ==================== GENERACIÓN DE PRIMOS ====================
+    primos = _primos_criba_ventana()
+    longitud = 64 * bits
+    altos = ((1 << bits_altos) - 1) << (bits - bits_altos)
 
-def criba_eratostenes(limite: int) -> List[int]:
+    while True:
+        # Punto de partida aleatorio; se avanza por ventanas mientras no pase de bits bits
+        inicio = generador.getrandbits(bits) | altos | 1
+        residuos = np.array([inicio % p for p in primos.tolist()], dtype=np.int64)
+        desplazamiento = 0
+
+        while inicio + desplazamiento < 1 << bits:
+            residuos_ventana = (residuos + desplazamiento) % primos
+            candidatos = _sobrevivientes_ventana(longitud, primos, residuos_ventana)
+            if seguro:
+                # (p - 1) / 2 sin factores pequeños impares: p ≢ 1 (mod r), y p ≡ 3 (mod 4)
+                candidatos = np.intersect1d(candidatos, _sobrevivientes_ventana(
+                    longitud, primos[1:], residuos_ventana[1:] - 1))
+                candidatos = candidatos[((inicio + desplazamiento) % 4 + candidatos) % 4 == 3]
+
+            for d in candidatos.tolist():
+                p = inicio + desplazamiento + d
+                if p >= 1 << bits:
+                    break
+                if seguro:
+                    if es_primo_bpsw((p - 1) // 2) and es_primo_bpsw(p):
+                        return p
+                elif es_primo_bpsw(p):
+                    return p
+
+            desplazamiento += longitud
+
+
+# Menor tamaño de módulo aceptado (con menos bits hay muy pocos primos
+# distintos con los dos bits altos encendidos) y máximo de pares (p, q)
+# probados antes de rendirse con un exponente incompatible
+MIN_BITS_RSA = 16
+MAX_INTENTOS_RSA = 1000
+
+
+def generar_claves_rsa(bits: int = 2048, exponente: int = 65537,
+                       generador: random.Random = None) -> Dict[str, int]:
     """
-    Implementa la Criba de Eratóstenes para generar primos hasta un límite.
+    Genera un par de claves RSA.
+
+    El exponente privado d se calcula como inverso de e módulo la función
+    de Carmichael λ(n) = mcm(p - 1, q - 1), que divide a φ(n) = (p - 1)(q - 1)
+    y da el menor d válido (igual que en PKCS #1).
 
     Args:
-        limite: Número máximo hasta el cual buscar primos
+        bits: Tamaño del módulo n = p·q en bits
+        exponente: Exponente público e
+        generador: Fuente de aleatoriedad (por defecto random.SystemRandom)
 
     Returns:
-        Lista de números primos hasta el límite
-    """
-    if limite < 2:
-        return []
+        Diccionario con el módulo n, los exponentes e (público) y d (privado)
+        y los primos p y q
 
-    es_primo = [True] * (limite + 1)
-    es_primo[0] = es_primo[1] = False
+    Raises:
+        ValueError: Si bits < MIN_BITS_RSA, si el exponente es par o menor que 3,
+            o si no se encuentra un par de primos compatible con el exponente
+    """
+    if bits < MIN_BITS_RSA:
+        raise ValueError(f"El módulo RSA debe tener al menos {MIN_BITS_RSA} bits")
+    if exponente < 3 or exponente % 2 == 0:
+        raise ValueError("El exponente público debe ser impar y mayor o igual que 3")
+
+    generador = generador or random.SystemRandom()
+    bits_p = bits - bits // 2
+
+    for _ in range(MAX_INTENTOS_RSA):
+        p = _primo_aleatorio(bits_p, False, generador, bits_altos=2)
+        q = _primo_aleatorio(bits // 2, False, generador, bits_altos=2)
+        lambda_n = math.lcm(p - 1, q - 1)
+        if p != q and mcd(exponente, lambda_n) == 1:
+            break
+    else:
+        raise ValueError(f"No se encontraron primos de {bits // 2} bits compatibles "
+                         f"con el exponente {exponente}")
 
-    for i in range(2, int(limite**0.5) + 1):
-        if es_primo[i]:
-            for j in range(i * i, limite + 1, i):
-                es_primo[j] = False
+    return {
+        "n": p * q,
+        "e": exponente,
+        "d": potencia_modular(exponente, -1, lambda_n),
+        "p": p,
+        "q": q
+    }
 
-    return [num for num, primo in enumerate(es_primo) if primo]
 
+# ==================== FACTORIZACIÓN ====================
 
-def criba_eratostenes_pasos(limite: int) -> List[Dict]:
+def _pollard_brent(n: int) -> int:
     """
-    Genera los pasos de la Criba de Eratóstenes para animación.
+    Encuentra un divisor no trivial de un número compuesto impar n
+    usando la variante de Brent del método rho de Pollard.
+
+    Los productos |x - y| se acumulan en lotes y se calcula un solo mcd por
+    lote. Las constantes se eligen en orden fijo, así que el resultado es
+    reproducible.
 
     Args:
-        limite: Número máximo hasta el cual ejecutar la criba
+        n: Número compuesto impar
 
     Returns:
-        Lista de diccionarios con el estado en cada paso
+        Un divisor d con 1 < d < n
     """
-    if limite < 2:
-        return []
+    tamano_lote = 128
+    n = entero(n)
 
-    pasos = []
-    es_primo = [True] * (limite + 1)
-    es_primo[0] = es_primo[1] = False
+    for c in range(1, n):
+        y, r, q, g = 2, 1, 1, 1
 
-    # Registrar estado inicial
-    pasos.append({
-        "numero_actual": 2,
-        "accion": "inicio",
-        "estado": es_primo.copy()
-    })
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
 
-    for i in range(2, int(limite**0.5) + 1):
-        if es_primo[i]:
-            marcados = []
-            for j in range(i * i, limite + 1, i):
-                if es_primo[j]:
-                    es_primo[j] = False
-                    marcados.append(j)
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(tamano_lote, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = mcd(q, n)
+                k += tamano_lote
+            r *= 2
 
-            if marcados:
-                pasos.append({
-                    "numero_actual": i,
-                    "accion": "marcar_multiplos",
-                    "marcados": marcados,
-                    "estado": es_primo.copy()
-                })
+        # El lote completo colapsó a n: repetir paso a paso desde ys
+        if g == n:
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = mcd(abs(x - ys), n)
 
-    return pasos
+        if g != n:
+            return g
 
+    return int(n)
 
-def generar_primos_hasta(limite: int) -> List[int]:
+
+def _factorizar_cofactor(n: int, factores: Dict[int, int]) -> None:
     """
-    Genera lista de números primos hasta un límite.
-    Alias para criba_eratostenes.
+    Factoriza recursivamente un número sin factores primos pequeños,
+    acumulando los resultados en el diccionario factores.
+    """
+    if n == 1:
+        return
+    if es_primo_miller_rabin(n, determinista=True):
+        factores[n] = factores.get(n, 0) + 1
+        return
+
+    divisor = _pollard_brent(n)
+    _factorizar_cofactor(divisor, factores)
+    _factorizar_cofactor(n // divisor, factores)
+
+
+@lru_cache(maxsize=4)
+def tabla_factor_minimo(limite: int = LIMITE_TABLA_FACTOR_MINIMO) -> np.ndarray:
+    """
+    Construye (una sola vez) la tabla de factor primo mínimo hasta un límite.
+
+    La posición n contiene el menor primo que divide a n (0 para 0 y 1).
+    Se guarda como arreglo de NumPy uint32 de solo lectura, compartido por
+    todas las llamadas con el mismo límite.
 
     Args:
-        limite: Número máximo
+        limite: Mayor número cubierto por la tabla
 
     Returns:
-        Lista de primos
+        Arreglo de NumPy uint32 de tamaño limite + 1
     """
-    return criba_eratostenes(limite)
+    tabla = np.zeros(limite + 1, dtype=np.uint32)
+    tabla[2::2] = 2
+
+    for p in criba_eratostenes_array(math.isqrt(limite))[1:].tolist():
+        multiplos = tabla[p * p::p]
+        multiplos[multiplos == 0] = p
+
+    # Los que siguen sin factor son primos: su factor mínimo son ellos mismos
+    primos = np.flatnonzero(tabla == 0)
+    primos = primos[primos >= 2]
+    tabla[primos] = primos
 
+    tabla.flags.writeable = False
+    return tabla
 
-def primos_en_rango(inicio: int, fin: int) -> List[int]:
+
+def factorizar_con_tabla(n: int, tabla: np.ndarray = None) -> Dict[int, int]:
     """
-    Encuentra todos los primos en un rango específico.
+    Factoriza n consultando la tabla de factor primo mínimo.
+    Requiere O(log n) consultas.
 
     Args:
-        inicio: Número inicial del rango
-        fin: Número final del rango
+        n: Número a factorizar (debe estar cubierto por la tabla)
+        tabla: Tabla de factor mínimo; por defecto la tabla compartida
 
     Returns:
-        Lista de primos en el rango [inicio, fin]
+        Diccionario {factor: exponente}, ordenado por factor
     """
-    if fin < 2:
-        return []
+    if tabla is None:
+        tabla = tabla_factor_minimo()
+    if n >= len(tabla):
+        raise ValueError(f"{n} excede el límite de la tabla ({len(tabla) - 1})")
+
+    factores = {}
+    while n > 1:
+        p = int(tabla[n])
+        factores[p] = factores.get(p, 0) + 1
+        n //= p
 
-    # Generar todos los primos hasta fin y filtrar
-    todos_primos = criba_eratostenes(fin)
-    return [p for p in todos_primos if p >= inicio]
+    return factores
 
 
-def enesimo_primo(n: int) -> int:
+def factorizar_lote(valores, tabla: np.ndarray = None) -> List[Dict[int, int]]:
     """
-    Encuentra el n-ésimo número primo.
+    Factoriza un arreglo completo de números con la tabla de factor mínimo.
+
+    En cada ronda se divide, de forma vectorizada, cada valor pendiente
+    por su factor mínimo, así que el número de rondas es a lo sumo
+    log2(max(valores)).
 
     Args:
-        n: Posición del primo buscado (1 = primer primo = 2)
+        valores: Arreglo de NumPy o iterable de enteros cubiertos por la tabla
+        tabla: Tabla de factor mínimo; por defecto la tabla compartida
 
     Returns:
-        El n-ésimo número primo
+        Lista con un diccionario {factor: exponente} por cada valor
     """
-    if n < 1:
-        return None
+    if tabla is None:
+        tabla = tabla_factor_minimo()
 
-    # Estimación del límite superior usando aproximación
-    if n < 6:
-        limite = 15
-    else:
-        # Aproximación: el n-ésimo primo ≈ n * ln(n)
-        limite = int(n * (math.log(n) + math.log(math.log(n)) + 2))
+    restos = np.array(valores, dtype=np.int64).ravel()
+    if restos.size and restos.max() >= len(tabla):
+        raise ValueError(f"Hay valores que exceden el límite de la tabla ({len(tabla) - 1})")
 
-    while True:
-        primos = criba_eratostenes(limite)
-        if len(primos) >= n:
-            return primos[n - 1]
-        limite *= 2
+    factores = [{} for _ in range(restos.size)]
+    activos = np.flatnonzero(restos > 1)
 
+    while activos.size:
+        primos = tabla[restos[activos]].astype(np.int64)
+        restos[activos] //= primos
 
-def siguiente_primo(n: int) -> int:
-    """
-    Encuentra el siguiente número primo después de n.
+        for i, p in zip(activos.tolist(), primos.tolist()):
+            factores[i][p] = factores[i].get(p, 0) + 1
 
-    Args:
-        n: Número de referencia
+        activos = activos[restos[activos] > 1]
 
-    Returns:
-        Siguiente primo después de n
+    return factores
+
+
+def _factorizar_segmento(bajo: int, alto: int,
+                         primos_base: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
     """
-    candidato = n + 1
-    while not es_primo_basico(candidato):
-        candidato += 1
-    return candidato
+    Factoriza todos los números de [bajo, alto] (bajo >= 2) cribando con los
+    primos base, que deben llegar hasta √alto.
 
+    Cada número guarda un residuo que se divide por los primos que lo
+    dividen; lo que queda al final, si es mayor que 1, es su único factor
+    primo mayor que √alto.
 
-def primo_anterior(n: int) -> int:
+    Returns:
+        Tupla (posiciones, primos, exponentes) ordenada por posición y primo,
+        con una entrada por cada factor primo de cada número (posición = n - bajo)
     """
-    Encuentra el número primo anterior a n.
+    longitud = alto - bajo + 1
+    residuos = np.arange(bajo, alto + 1, dtype=np.int64)
+    primos = primos_base[:np.searchsorted(primos_base, math.isqrt(alto), side="right")]
+    posiciones = (-bajo) % primos
+
+    partes_pos, partes_primo, partes_exp = [], [], []
+
+    # Primos con muchos múltiplos: una rebanada por cada potencia p^k ≤ alto
+    corte = int(np.searchsorted(primos, longitud // 32))
+    for p, posicion in zip(primos[:corte].tolist(), posiciones[:corte].tolist()):
+        multiplos = np.arange(posicion, longitud, p)
+        exponentes = np.ones(len(multiplos), dtype=np.int64)
+        residuos[posicion::p] //= p
+
+        potencia = p * p
+        while potencia <= alto:
+            inicio = (-bajo) % potencia
+            residuos[inicio::potencia] //= p
+            exponentes[(inicio - posicion) // p::potencia // p] += 1
+            potencia *= p
+
+        partes_pos.append(multiplos)
+        partes_primo.append(np.full(len(multiplos), p, dtype=np.int64))
+        partes_exp.append(exponentes)
+
+    # Primos con pocos múltiplos: todos a la vez, un múltiplo por vuelta.
+    # Varios primos pueden caer en el mismo número, por eso se divide con ufunc.at
+    primos = primos[corte:]
+    posiciones = posiciones[corte:]
+    rondas_pos, rondas_primo, rondas_exp = [], [], []
+    while posiciones.size:
+        dentro = posiciones < longitud
+        primos = primos[dentro]
+        posiciones = posiciones[dentro]
+
+        exponentes = np.zeros(len(primos), dtype=np.int64)
+        divide = np.ones(len(primos), dtype=bool)
+        while divide.any():
+            np.floor_divide.at(residuos, posiciones[divide], primos[divide])
+            exponentes += divide
+            divide &= residuos[posiciones] % primos == 0
+
+        rondas_pos.append(posiciones.copy())
+        rondas_primo.append(primos)
+        rondas_exp.append(exponentes)
+        posiciones = posiciones + primos
+
+    if rondas_primo:
+        # Reordenar por primo, para que todas las partes queden en orden creciente de primo
+        primos = np.concatenate(rondas_primo)
+        orden = np.argsort(primos, kind="stable")
+        partes_pos.append(np.concatenate(rondas_pos)[orden])
+        partes_primo.append(primos[orden])
+        partes_exp.append(np.concatenate(rondas_exp)[orden])
+
+    # Factor primo grande restante
+    grandes = np.flatnonzero(residuos > 1)
+    partes_pos.append(grandes)
+    partes_primo.append(residuos[grandes])
+    partes_exp.append(np.ones(len(grandes), dtype=np.int64))
+
+    # Las partes están en orden creciente de primo: un orden estable por
+    # posición deja los factores de cada número ordenados
+    posiciones = np.concatenate(partes_pos)
+    primos = np.concatenate(partes_primo)
+    exponentes = np.concatenate(partes_exp)
+    orden = np.argsort(posiciones, kind="stable")
+
+    return posiciones[orden], primos[orden], exponentes[orden]
+
+
+def iterar_factorizaciones_bloques(inicio: int, fin: int,
+                                   tamano_bloque: int = TAMANO_BLOQUE_CRIBA
+                                   ) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Factoriza todos los números de [inicio, fin] con una criba segmentada,
+    reutilizando los primos base hasta √fin en todos los bloques.
 
     Args:
-        n: Número de referencia
+        inicio: Número inicial del rango (se empieza en 2 como mínimo)
+        fin: Número final del rango
+        tamano_bloque: Cantidad de números factorizados por bloque
 
-    Returns:
-        Primo anterior a n, o None si no existe
+    Yields:
+        Tuplas (numeros, inicios, primos, exponentes) por bloque: los factores
+        de numeros[i] son primos[inicios[i]:inicios[i + 1]] con sus exponentes
     """
-    if n <= 2:
-        return None
+    inicio = max(inicio, 2)
+    if fin < inicio:
+        return
 
-    candidato = n - 1
-    while candidato > 1:
-        if es_primo_basico(candidato):
-            return candidato
-        candidato -= 1
+    primos_base = criba_eratostenes_array(math.isqrt(fin))
 
-    return None
+    for bajo in range(inicio, fin + 1, tamano_bloque):
+        alto = min(bajo + tamano_bloque - 1, fin)
+        posiciones, primos, exponentes = _factorizar_segmento(bajo, alto, primos_base)
+        conteos = np.bincount(posiciones, minlength=alto - bajo + 1)
+        inicios = np.concatenate(([0], np.cumsum(conteos)))
+        yield np.arange(bajo, alto + 1, dtype=np.int64), inicios, primos, exponentes
 
 
-# ==================== FACTORIZACIÓN ====================
+def factorizar_rango(inicio: int, fin: int) -> Iterator[Tuple[int, Dict[int, int]]]:
+    """
+    Factoriza todos los números de un rango, fila por fila.
+
+    Args:
+        inicio: Número inicial del rango (se empieza en 2 como mínimo)
+        fin: Número final del rango
+
+    Yields:
+        Tuplas (n, {factor: exponente}) en orden creciente de n
+    """
+    for numeros, inicios, primos, exponentes in iterar_factorizaciones_bloques(inicio, fin):
+        primos = primos.tolist()
+        exponentes = exponentes.tolist()
+        inicios = inicios.tolist()
+        for i, n in enumerate(numeros.tolist()):
+            desde, hasta = inicios[i], inicios[i + 1]
+            yield n, dict(zip(primos[desde:hasta], exponentes[desde:hasta]))
+
 
 def factorizacion_prima(n: int) -> Dict[int, int]:
     """
     Calcula la factorización prima de un número.
 
+    Primero divide por los primos pequeños; si queda un cofactor compuesto,
+    lo separa con Pollard-Brent rho de forma recursiva.
+
     Args:
         n: Número a factorizar
 
     Returns:
-        Diccionario {factor: exponente}
+        Diccionario {factor: exponente}, ordenado por factor
         Ejemplo: 60 -> {2: 2, 3: 1, 5: 1} porque 60 = 2² × 3 × 5
     """
     if n < 2:
         return {}
+    if n <= LIMITE_TABLA_FACTOR_MINIMO:
+        return factorizar_con_tabla(n)
 
     factores = {}
 
-    # Verificar factor 2
-    while n % 2 == 0:
-        factores[2] = factores.get(2, 0) + 1
-        n //= 2
-
-    # Verificar factores impares
-    i = 3
-    while i * i <= n:
-        while n % i == 0:
-            factores[i] = factores.get(i, 0) + 1
-            n //= i
-        i += 2
-
-    # Si queda algo, es un factor primo
-    if n > 2:
-        factores[n] = factores.get(n, 0) + 1
+    # División por prueba con los primos pequeños
+    for p in _primos_pequenos():
+        if p * p > n:
+            break
+        while n % p == 0:
+            factores[p] = factores.get(p, 0) + 1
+            n //= p
+
+    # Lo que queda no tiene factores menores que LIMITE_PRIMOS_PEQUENOS
+    if n > 1:
+        if n < LIMITE_PRIMOS_PEQUENOS ** 2:
+            factores[n] = factores.get(n, 0) + 1
+        else:
+            _factorizar_cofactor(n, factores)
 
-    return factores
+    return dict(sorted(factores.items()))
 
 
 def factorizacion_con_proceso(n: int) -> Tuple[Dict[int, int], List[Dict]]:
@@ -342,51 +2069,458 @@ def factorizacion_con_proceso(n: int) -> Tuple[Dict[int, int], List[Dict]]:
     if n < 2:
         return {}, []
 
-    factores = {}
+    factores = factorizacion_prima(n)
     pasos = []
     numero_actual = n
 
-    # Factor 2
-    while numero_actual % 2 == 0:
-        factores[2] = factores.get(2, 0) + 1
-        pasos.append({
-            "divisor": 2,
-            "numero_antes": numero_actual,
-            "numero_despues": numero_actual // 2
-        })
-        numero_actual //= 2
-
-    # Factores impares
-    i = 3
-    while i * i <= numero_actual:
-        while numero_actual % i == 0:
-            factores[i] = factores.get(i, 0) + 1
+    # Reconstruir las divisiones sucesivas, de menor a mayor factor
+    for factor, exponente in factores.items():
+        for _ in range(exponente):
             pasos.append({
-                "divisor": i,
+                "divisor": factor,
                 "numero_antes": numero_actual,
-                "numero_despues": numero_actual // i
+                "numero_despues": numero_actual // factor
             })
-            numero_actual //= i
-        i += 2
-
-    # Factor primo restante
-    if numero_actual > 2:
-        factores[numero_actual] = factores.get(numero_actual, 0) + 1
-        pasos.append({
-            "divisor": numero_actual,
-            "numero_antes": numero_actual,
-            "numero_despues": 1
-        })
+            numero_actual //= factor
 
     return factores, pasos
 
 
+# ==================== FUNCIONES ARITMÉTICAS ====================
+
+# Funciones multiplicativas disponibles: φ (Euler), μ (Möbius), d (número de divisores), σ (suma de divisores)
+FUNCIONES_MULTIPLICATIVAS = ("phi", "mu", "divisores", "sigma")
+
+
+def _funciones_de_factores(inicios: np.ndarray, primos: np.ndarray,
+                           exponentes: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Evalúa φ, μ, d y σ a partir de factorizaciones en formato comprimido
+    (los factores del número i son primos[inicios[i]:inicios[i + 1]]).
+
+    Cada función se calcula sobre p^e por separado y los valores de cada
+    número se multiplican con reduceat. Todo número ≥ 2 tiene al menos un factor.
+    """
+    # p^(e-1) y σ(p^e) = 1 + p + ... + p^e (regla de Horner); casi todos
+    # los exponentes valen 1, así que solo se recorren los mayores
+    altos = np.flatnonzero(exponentes > 1)
+    primos_altos = primos[altos]
+    exponentes_altos = exponentes[altos]
+    potencia_altos = primos_altos.copy()
+    sigma_altos = primos_altos * primos_altos + primos_altos + 1
+    for k in range(3, int(exponentes_altos.max(initial=0)) + 1):
+        con_potencia = exponentes_altos >= k
+        potencia_altos[con_potencia] *= primos_altos[con_potencia]
+        sigma_altos[con_potencia] = sigma_altos[con_potencia] * primos_altos[con_potencia] + 1
+
+    potencia_previa = np.ones(len(primos), dtype=np.int64)
+    potencia_previa[altos] = potencia_altos
+    sigma = primos + 1
+    sigma[altos] = sigma_altos
+
+    por_factor = {
+        "phi": potencia_previa * (primos - 1),
+        "mu": np.where(exponentes == 1, -1, 0),
+        "divisores": exponentes + 1,
+        "sigma": sigma
+    }
+    return {nombre: np.multiply.reduceat(valores, inicios[:-1])
+            for nombre, valores in por_factor.items()}
+
+
+def iterar_funciones_multiplicativas(inicio: int, fin: int,
+                                     tamano_bloque: int = TAMANO_BLOQUE_CRIBA
+                                     ) -> Iterator[Tuple[np.ndarray, Dict[str, np.ndarray]]]:
+    """
+    Calcula φ(n), μ(n), d(n) y σ(n) para todos los n de [inicio, fin] por bloques,
+    a partir de la criba segmentada de factorizaciones.
+
+    Args:
+        inicio: Número inicial del rango
+        fin: Número final del rango
+        tamano_bloque: Cantidad de números por bloque
+
+    Yields:
+        Tuplas (numeros, valores), donde valores tiene un arreglo por cada
+        nombre de FUNCIONES_MULTIPLICATIVAS alineado con numeros
+    """
+    if inicio <= 1 <= fin:
+        # 1 no tiene factores primos: todas las funciones valen 1
+        yield np.array([1], dtype=np.int64), {nombre: np.ones(1, dtype=np.int64)
+                                              for nombre in FUNCIONES_MULTIPLICATIVAS}
+
+    for numeros, inicios, primos, exponentes in iterar_factorizaciones_bloques(inicio, fin, tamano_bloque):
+        yield numeros, _funciones_de_factores(inicios, primos, exponentes)
+
+
+def funciones_multiplicativas(limite: int) -> Dict[str, np.ndarray]:
+    """
+    Tablas de φ(n), μ(n), d(n) y σ(n) para 0 ≤ n ≤ limite.
+
+    Args:
+        limite: Mayor n de las tablas
+
+    Returns:
+        Diccionario {nombre: arreglo de NumPy (int64) de largo limite + 1};
+        la posición 0 vale 0 en todas las tablas
+    """
+    tablas = {nombre: np.zeros(max(limite, 0) + 1, dtype=np.int64)
+              for nombre in FUNCIONES_MULTIPLICATIVAS}
+
+    for numeros, valores in iterar_funciones_multiplicativas(1, limite):
+        for nombre, arreglo in valores.items():
+            tablas[nombre][numeros[0]:numeros[-1] + 1] = arreglo
+
+    return tablas
+
+
+# ==================== ESTADÍSTICAS DE BRECHAS ====================
+
+# Cantidad de números procesados entre dos puntos de control del analizador de brechas
+TAMANO_SEGMENTO_BRECHAS = 10**8
+
+
+class AnalizadorBrechas:
+    """
+    Estadísticas de las brechas entre primos consecutivos, calculadas en
+    flujo sobre la criba segmentada: la memoria no depende del límite.
+
+    Acumula el histograma de brechas, la primera aparición de cada brecha,
+    las brechas máximas (récords) con su cociente g / ln²(p) respecto de la
+    conjetura de Cramér, y el campeón de saltos (la brecha más frecuente).
+    Al final de cada segmento guarda un punto de control; el estado completo
+    se puede guardar en disco y retomar más tarde con cargar().
+    """
+
+    def __init__(self):
+        self.hasta = 2             # números ya procesados: [2, hasta]
+        self.ultimo_primo = 2
+        self.cantidad_primos = 1
+        self.histograma = np.zeros(1, dtype=np.int64)          # histograma[g] = veces que aparece g
+        self.primera_aparicion = np.zeros(1, dtype=np.int64)   # menor p con brecha g (0 = ninguno)
+        self.records = []          # (brecha, primo, brecha / ln²(primo)) en orden
+        self.campeones = []        # (x, brecha) en cada primo x donde cambia el campeón de saltos
+        self.puntos_control = []   # un resumen por segmento procesado
+
+    @property
+    def brecha_maxima(self) -> int:
+        """Mayor brecha encontrada hasta ahora."""
+        return self.records[-1][0] if self.records else 0
+
+    @property
+    def campeon(self) -> int:
+        """Brecha más frecuente hasta ahora (la menor en caso de empate)."""
+        return int(np.argmax(self.histograma)) if self.histograma.any() else 0
+
+    def _agregar_primos(self, primos: np.ndarray) -> None:
+        """Incorpora un bloque de primos consecutivos mayores que ultimo_primo."""
+        if not len(primos):
+            return
+
+        anteriores = np.concatenate(([self.ultimo_primo], primos[:-1]))
+        brechas = primos - anteriores
+
+        # Histograma, agrandado si aparece una brecha mayor
+        conteos = np.bincount(brechas)
+        if len(conteos) > len(self.histograma):
+            relleno = len(conteos) - len(self.histograma)
+            self.histograma = np.concatenate((self.histograma, np.zeros(relleno, dtype=np.int64)))
+            self.primera_aparicion = np.concatenate((self.primera_aparicion,
+                                                     np.zeros(relleno, dtype=np.int64)))
+        self._seguir_campeones(primos, brechas, conteos)
+        self.histograma[:len(conteos)] += conteos
+
+        # Primera aparición de las brechas que no se habían visto
+        valores, indices = np.unique(brechas, return_index=True)
+        nuevas = self.primera_aparicion[valores] == 0
+        self.primera_aparicion[valores[nuevas]] = anteriores[indices[nuevas]]
+
+        # Récords: brechas mayores que todas las anteriores
+        maximo_previo = np.maximum.accumulate(np.concatenate(([self.brecha_maxima], brechas)))[:-1]
+        for i in np.flatnonzero(brechas > maximo_previo).tolist():
+            primo = int(anteriores[i])
+            brecha = int(brechas[i])
+            self.records.append((brecha, primo, brecha / math.log(primo) ** 2))
+
+        self.ultimo_primo = int(primos[-1])
+        self.cantidad_primos += len(primos)
+
+    def _seguir_campeones(self, primos: np.ndarray, brechas: np.ndarray,
+                          conteos: np.ndarray) -> None:
+        """
+        Registra, primo por primo, los cambios del campeón de saltos dentro
+        de un bloque (se llama antes de sumar conteos al histograma).
+
+        Solo puede liderar en algún punto del bloque una brecha cuyo conteo
+        final alcance el máximo previo, así que basta con seguir el conteo
+        acumulado de esas pocas brechas.
+        """
+        finales = self.histograma.copy()
+        finales[:len(conteos)] += conteos
+        candidatas = np.flatnonzero(finales >= self.histograma.max())
+        if self.cantidad_primos == 1:
+            candidatas = candidatas[candidatas > 0]  # aún no hay ninguna brecha
+
+        acumulados = (self.histograma[candidatas][:, None] +
+                      np.cumsum(brechas == candidatas[:, None], axis=1))
+        lideres = candidatas[np.argmax(acumulados, axis=0)]
+
+        previo = self.campeones[-1][1] if self.campeones else 0
+        cambios = np.flatnonzero(lideres != np.concatenate(([previo], lideres[:-1])))
+        self.campeones.extend(zip(primos[cambios].tolist(), lideres[cambios].tolist()))
+
+    def avanzar(self, hasta: int, tamano_segmento: int = TAMANO_SEGMENTO_BRECHAS) -> Iterator[Dict]:
+        """
+        Procesa los primos hasta hasta, segmento por segmento.
+
+        Args:
+            hasta: Límite superior del análisis
+            tamano_segmento: Números procesados entre dos puntos de control
+
+        Yields:
+            El resumen de cada segmento (ver puntos_control), para mostrar
+            el avance o guardar el estado entre segmentos
+        """
+        while self.hasta < hasta:
+            bajo = self.hasta + 1
+            alto = min(self.hasta + tamano_segmento, hasta)
+            for primos in criba_segmentada(bajo, alto):
+                self._agregar_primos(primos)
+            self.hasta = alto
+
+            campeon = self.campeon
+            punto = {
+                "hasta": alto,
+                "cantidad_primos": self.cantidad_primos,
+                "brecha_maxima": self.brecha_maxima,
+                "campeon": campeon,
+                "brecha_media": (self.ultimo_primo - 2) / max(self.cantidad_primos - 1, 1),
+                "ln_hasta": math.log(alto)
+            }
+            self.puntos_control.append(punto)
+            yield punto
+
+    def a_diccionario(self) -> Dict:
+        """Estado completo como diccionario serializable en JSON."""
+        return {
+            "hasta": self.hasta,
+            "ultimo_primo": self.ultimo_primo,
+            "cantidad_primos": self.cantidad_primos,
+            "histograma": self.histograma.tolist(),
+            "primera_aparicion": self.primera_aparicion.tolist(),
+            "records": self.records,
+            "campeones": self.campeones,
+            "puntos_control": self.puntos_control
+        }
+
+    @classmethod
+    def desde_diccionario(cls, datos: Dict) -> "AnalizadorBrechas":
+        """Reconstruye un analizador a partir de a_diccionario()."""
+        analizador = cls()
+        analizador.hasta = datos["hasta"]
+        analizador.ultimo_primo = datos["ultimo_primo"]
+        analizador.cantidad_primos = datos["cantidad_primos"]
+        analizador.histograma = np.array(datos["histograma"], dtype=np.int64)
+        analizador.primera_aparicion = np.array(datos["primera_aparicion"], dtype=np.int64)
+        analizador.records = [tuple(r) for r in datos["records"]]
+        analizador.campeones = [tuple(c) for c in datos["campeones"]]
+        analizador.puntos_control = list(datos["puntos_control"])
+        return analizador
+
+    def guardar(self, ruta: str) -> None:
+        """Guarda el estado en un archivo JSON para retomar el análisis."""
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            json.dump(self.a_diccionario(), archivo)
+
+    @classmethod
+    def cargar(cls, ruta: str) -> "AnalizadorBrechas":
+        """Carga un estado guardado con guardar()."""
+        with open(ruta, encoding="utf-8") as archivo:
+            return cls.desde_diccionario(json.load(archivo))
+
+
+# ==================== CONJETURA DE GOLDBACH ====================
+
+# Hasta esta longitud la autoconvolución se hace con una sola FFT en float64;
+# por encima, el error de redondeo y la memoria crecen con la longitud, así que
+# se convoluciona por pares de bloques, cuyos productos son lo bastante chicos
+# para redondearse exactamente a enteros antes de acumularlos en int64
+UMBRAL_FFT_GOLDBACH = 1 << 25
+TAMANO_BLOQUE_GOLDBACH = 1 << 22
+
+
+def _autoconvolucion(indicador: np.ndarray, longitud: int,
+                     tamano_bloque: int = TAMANO_BLOQUE_GOLDBACH) -> np.ndarray:
+    """
+    Autoconvolución c[k] = Σ indicador[i] · indicador[k - i] con NumPy FFT.
+
+    Args:
+        indicador: Arreglo de ceros y unos
+        longitud: Cantidad de términos de c que se necesitan
+        tamano_bloque: Tamaño de bloque si el arreglo supera UMBRAL_FFT_GOLDBACH
+
+    Returns:
+        Arreglo (int64) con c[0], ..., c[longitud - 1]
+    """
+    valores = indicador.astype(np.float64)
+    resultado = np.zeros(longitud, dtype=np.int64)
+
+    if len(valores) <= UMBRAL_FFT_GOLDBACH:
+        tamano_fft = 1 << (2 * len(valores) - 1).bit_length()
+        espectro = np.fft.rfft(valores, tamano_fft)
+        producto = np.rint(np.fft.irfft(espectro * espectro, tamano_fft)[:longitud])
+        resultado[:len(producto)] = producto.astype(np.int64)
+        return resultado
+
+    # Por bloques: el par (i, j) aporta a partir de la posición (i + j) · tamano_bloque,
+    # y los pares i ≠ j se cuentan dos veces por simetría
+    cantidad_bloques = -(-len(valores) // tamano_bloque)
+    tamano_fft = 2 * tamano_bloque
+    for i in range(cantidad_bloques):
+        if 2 * i * tamano_bloque >= longitud:
+            break
+        espectro_i = np.fft.rfft(valores[i * tamano_bloque:(i + 1) * tamano_bloque], tamano_fft)
+
+        for j in range(i, cantidad_bloques):
+            desplazamiento = (i + j) * tamano_bloque
+            if desplazamiento >= longitud:
+                break
+            espectro_j = espectro_i if j == i else np.fft.rfft(
+                valores[j * tamano_bloque:(j + 1) * tamano_bloque], tamano_fft)
+
+            parcial = np.fft.irfft(espectro_i * espectro_j, tamano_fft)
+            parcial = np.rint(parcial[:longitud - desplazamiento]).astype(np.int64)
+            if j != i:
+                parcial *= 2
+            resultado[desplazamiento:desplazamiento + len(parcial)] += parcial
+
+    return resultado
+
+
+def conteos_goldbach(limite: int) -> np.ndarray:
+    """
+    Cantidad de particiones de Goldbach de todos los pares hasta un límite.
+
+    Con el arreglo de los impares primos (posición i = 2i + 1), la suma
+    (2i + 1) + (2j + 1) = 2(i + j + 1), así que la autoconvolución del
+    arreglo da de una vez los pares ordenados de primos que suman cada par.
+
+    Args:
+        limite: Mayor número par considerado
+
+    Returns:
+        Arreglo r (int64) de limite // 2 + 1 posiciones, donde r[n] es la
+        cantidad de formas de escribir 2n como p + q con p ≤ q primos
+    """
+    mitad = limite // 2
+    conteos = np.zeros(mitad + 1, dtype=np.int64)
+    if mitad < 2:
+        return conteos
+
+    conteos[2] = 1  # 4 = 2 + 2
+    if mitad < 3:
+        return conteos
+
+    # Impares primos hasta limite - 3 (el menor sumando es 3)
+    es_primo = _criba_impares(2 * mitad - 3)
+    ordenados = _autoconvolucion(es_primo, mitad)
+
+    # ordenados[k] cuenta los pares ordenados que suman 2(k + 1); el par p + p
+    # aparece una sola vez y corresponde a k = 2i con es_primo[i]
+    repetidos = np.zeros(mitad, dtype=np.int64)
+    repetidos[0::2] = es_primo[:(mitad + 1) // 2]
+    conteos[2:] += (ordenados[1:] + repetidos[1:]) // 2
+
+    return conteos
+
+
+def particiones_goldbach(n: int) -> List[Tuple[int, int]]:
+    """
+    Lista las particiones de Goldbach de un número par.
+
+    Args:
+        n: Número par mayor o igual que 4
+
+    Returns:
+        Lista de pares (p, q) con p ≤ q primos y p + q = n, ordenada por p
+    """
+    if n < 4 or n % 2:
+        raise ValueError("n debe ser par y mayor o igual que 4")
+    if n == 4:
+        return [(2, 2)]
+
+    # p recorre los primos impares hasta n/2 y q = n - p debe ser primo
+    pequenos = criba_eratostenes_array(n // 2)[1:]
+    grandes = np.concatenate([np.zeros(0, dtype=np.int64)] +
+                             list(criba_segmentada(n - n // 2, n - 3)))
+    complementos = n - pequenos
+    posiciones = np.searchsorted(grandes, complementos)
+    posiciones = np.minimum(posiciones, max(len(grandes) - 1, 0))
+    validos = grandes[posiciones] == complementos if len(grandes) else np.zeros(0, dtype=bool)
+
+    return list(zip(pequenos[validos].tolist(), complementos[validos].tolist()))
+
+
 # ==================== PROPIEDADES Y ANÁLISIS ====================
 
+def _contar_primos_lucy(n: int) -> int:
+    """
+    Calcula π(n) con el método de Lucy_Hedgehog (variante de Legendre).
+
+    Mantiene S(v) = cantidad de números en [2, v] que sobreviven a la criba
+    con los primos menores que p, solo para los O(√n) valores v = n // i.
+    Por cada primo p ≤ √n se actualiza S(v) -= S(v // p) - S(p - 1),
+    vectorizado con NumPy. Memoria O(√n) y tiempo O(n^(3/4)).
+
+    Args:
+        n: Límite superior (n >= 1)
+
+    Returns:
+        Cantidad de primos ≤ n
+    """
+    r = math.isqrt(n)
+    indices = np.arange(r + 1, dtype=np.int64)
+    cocientes = np.zeros(r + 1, dtype=np.int64)
+    cocientes[1:] = n // indices[1:]
+
+    # pequenos[v] = S(v) para v ≤ r;  grandes[i] = S(n // i) para i ≤ r
+    pequenos = indices - 1
+    grandes = cocientes - 1
+
+    # Antes de procesar el primo p, S(p - 1) es la cantidad de primos menores que p
+    for primos_menores, p in enumerate(criba_eratostenes_array(r).tolist()):
+        cuadrado = p * p
+        tope = min(r, n // cuadrado)
+        corte = min(tope, r // p)
+
+        # n // (i*p) es grande (> r) mientras i*p ≤ r
+        tramo = grandes[1:corte + 1]
+        tramo -= grandes[p:corte * p + 1:p]
+        tramo += primos_menores
+
+        if tope > corte:
+            tramo = grandes[corte + 1:tope + 1]
+            tramo -= pequenos[cocientes[corte + 1:tope + 1] // p]
+            tramo += primos_menores
+
+        if cuadrado <= r:
+            tramo = pequenos[cuadrado:]
+            tramo -= pequenos[indices[cuadrado:] // p]
+            tramo += primos_menores
+
+    return int(grandes[1])
+
+
 def contar_primos_hasta(n: int) -> int:
     """
     Función π(x): cuenta cuántos primos hay menores o iguales a n.
 
+    Para n pequeño consulta la tabla compartida de primos; a partir de
+    UMBRAL_CONTEO_SUBLINEAL usa el método sublineal de Lucy_Hedgehog,
+    que solo necesita memoria O(√n) y le gana a cualquier criba. Para
+    contar en paralelo los primos de un tramo [inicio, fin] arbitrario,
+    usar criba_paralela(inicio, fin, "conteo", workers).
+
     Args:
         n: Límite superior
 
@@ -395,34 +2529,64 @@ def contar_primos_hasta(n: int) -> int:
     """
     if n < 2:
         return 0
-    return len(criba_eratostenes(n))
+    if n >= UMBRAL_CONTEO_SUBLINEAL and _base_cubre(n):
+        return _base_primos.contar_hasta(n)
+    if n >= UMBRAL_CONTEO_SUBLINEAL:
+        return _contar_primos_lucy(n)
+    return tabla_primos_compartida().contar_hasta(n)
 
 
-def primos_gemelos(limite: int) -> List[Tuple[int, int]]:
+def primos_gemelos(limite: int, workers: int = None) -> List[Tuple[int, int]]:
     """
     Encuentra pares de primos gemelos hasta un límite.
     Primos gemelos: primos que difieren en 2 (ej: 3 y 5, 11 y 13)
 
     Args:
         limite: Número máximo para buscar
+        workers: Si es mayor que 1, criba en paralelo con esa cantidad de procesos
 
     Returns:
         Lista de tuplas (p, p+2) donde ambos son primos
     """
-    primos = criba_eratostenes(limite)
-    gemelos = []
+    return buscar_constelaciones("gemelos", 2, limite, workers)
+
+
+def es_potencia_perfecta(n: int) -> Tuple[bool, int, int]:
+    """
+    Verifica si un número es potencia perfecta, con el mayor exponente posible.
+
+    Solo prueba exponentes primos k ≤ log₂(n): si n = r^k, se descompone r
+    de la misma forma, así que nunca hace falta factorizar n.
+
+    Args:
+        n: Número a verificar
+
+    Returns:
+        Tupla (es_potencia, base, exponente)
+        Si es potencia: (True, b, k) donde n = b^k con k ≥ 2 máximo
+        Si no: (False, 0, 0)
+    """
+    if n < 4:
+        return False, 0, 0
 
-    for i in range(len(primos) - 1):
-        if primos[i + 1] - primos[i] == 2:
-            gemelos.append((primos[i], primos[i + 1]))
+    for k in criba_eratostenes(n.bit_length()):
+        raiz = raiz_entera(n, k)
+        if raiz ** k == n:
+            es_potencia, base, exponente = es_potencia_perfecta(raiz)
+            if es_potencia:
+                return True, base, exponente * k
+            return True, raiz, k
 
-    return gemelos
+    return False, 0, 0
 
 
 def es_potencia_de_primo(n: int) -> Tuple[bool, int, int]:
     """
     Verifica si un número es potencia de un primo.
 
+    En lugar de factorizar n, se extrae la base de la mayor potencia
+    perfecta (ver es_potencia_perfecta) y se verifica que sea prima.
+
     Args:
         n: Número a verificar
 
@@ -434,12 +2598,11 @@ def es_potencia_de_primo(n: int) -> Tuple[bool, int, int]:
     if n < 2:
         return False, 0, 0
 
-    factores = factorizacion_prima(n)
+    es_potencia, base, exponente = es_potencia_perfecta(n)
+    if not es_potencia:
+        base, exponente = n, 1
 
-    # Si hay exactamente un factor primo, es potencia de primo
-    if len(factores) == 1:
-        base = list(factores.keys())[0]
-        exponente = factores[base]
+    if es_primo_miller_rabin(base, determinista=True):
         return True, base, exponente
 
     return False, 0, 0
@@ -455,38 +2618,18 @@ def distancia_primo_mas_cercano(n: int) -> Dict:
     Returns:
         Diccionario con información del primo más cercano
     """
-    if es_primo_basico(n):
+    cercano = primo_mas_cercano(n)
+
+    if cercano == n:
         return {
             "es_primo": True,
             "distancia": 0,
             "primo_mas_cercano": n
         }
 
-    sig = siguiente_primo(n)
-    ant = primo_anterior(n)
-
-    if ant is None:
-        return {
-            "es_primo": False,
-            "distancia": sig - n,
-            "primo_mas_cercano": sig,
-            "direccion": "siguiente"
-        }
-
-    dist_sig = sig - n
-    dist_ant = n - ant
-
-    if dist_sig <= dist_ant:
-        return {
-            "es_primo": False,
-            "distancia": dist_sig,
-            "primo_mas_cercano": sig,
-            "direccion": "siguiente"
-        }
-    else:
-        return {
-            "es_primo": False,
-            "distancia": dist_ant,
-            "primo_mas_cercano": ant,
-            "direccion": "anterior"
-        }
+    return {
+        "es_primo": False,
+        "distancia": abs(cercano - n),
+        "primo_mas_cercano": cercano,
+        "direccion": "siguiente" if cercano > n else "anterior"
+    }
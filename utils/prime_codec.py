@@ -0,0 +1,325 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de codificación compacta de listas de primos
+Guarda las brechas entre primos consecutivos como varint (≈ 1 byte por primo)
+con puntos de control absolutos para acceso aleatorio
+"""
+
+import io
+import struct
+from typing import BinaryIO, Iterator, Tuple
+
+import numpy as np
+
+
+# ==================== FORMATO ====================
+
+# Estructura del formato:
+#   cabecera: firma (8s), versión (I), primos entre puntos de control (I)
+#   datos:    brecha // 2 de cada par de primos consecutivos como varint LEB128
+#             (la brecha desde 2 es la única impar y se reconstruye como 2v + 1)
+#   índice:   valores (uint64) y posiciones en los datos (uint64) de los puntos de control
+#   pie:      total de primos (Q), puntos de control (Q), posición del índice (Q), firma (8s)
+FIRMA = b"PRIMGAPS"
+VERSION = 1
+FORMATO_CABECERA = "<8sII"
+FORMATO_PIE = "<QQQ8s"
+TAMANO_CABECERA = struct.calcsize(FORMATO_CABECERA)
+TAMANO_PIE = struct.calcsize(FORMATO_PIE)
+
+# Cada cuántos primos se guarda un punto de control absoluto
+INTERVALO_PUNTOS_CONTROL = 1024
+
+# Cantidad de bytes leídos por vez al decodificar en flujo
+TAMANO_LECTURA = 1 << 20
+
+MIME_PRIMOS_CODIFICADOS = "application/octet-stream"
+
+
+# ==================== VARINT VECTORIZADO ====================
+
+def _longitudes_varint(valores: np.ndarray) -> np.ndarray:
+    """Cantidad de bytes que ocupa cada valor como varint."""
+    longitudes = np.ones(len(valores), dtype=np.int64)
+    resto = valores >> np.uint64(7)
+    while resto.any():
+        longitudes += resto > 0
+        resto >>= np.uint64(7)
+    return longitudes
+
+
+def _codificar_varint(valores: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Codifica un arreglo uint64 como varint LEB128.
+
+    Returns:
+        Tupla (bytes_codificados, longitud_de_cada_valor)
+    """
+    longitudes = _longitudes_varint(valores)
+    if len(valores) and longitudes.max() == 1:
+        return valores.astype(np.uint8), longitudes
+
+    salida = np.zeros(int(longitudes.sum()), dtype=np.uint8)
+    inicios = np.cumsum(longitudes) - longitudes
+    for j in range(int(longitudes.max()) if len(valores) else 0):
+        con_byte = longitudes > j
+        septeto = (valores[con_byte] >> np.uint64(7 * j)) & np.uint64(0x7F)
+        continua = (longitudes[con_byte] > j + 1).astype(np.uint64) << np.uint64(7)
+        salida[inicios[con_byte] + j] = septeto | continua
+    return salida, longitudes
+
+
+def _decodificar_varint(datos: np.ndarray) -> np.ndarray:
+    """Decodifica una secuencia completa de varint LEB128 como arreglo uint64."""
+    if not (datos & 0x80).any():
+        return datos.astype(np.uint64)
+
+    finales = np.flatnonzero(datos < 0x80)
+    inicios = np.concatenate(([0], finales[:-1] + 1))
+    posicion = np.arange(len(datos)) - np.repeat(inicios, finales - inicios + 1)
+    septetos = (datos & 0x7F).astype(np.uint64) << (7 * posicion).astype(np.uint64)
+    return np.add.reduceat(septetos, inicios)
+
+
+def _reconstruir(inicial: int, valores: np.ndarray) -> np.ndarray:
+    """Primos que siguen a inicial a partir de los valores brecha // 2."""
+    brechas = valores.astype(np.int64) * 2
+    if inicial == 2 and len(brechas):
+        brechas[0] += 1
+    return inicial + np.cumsum(brechas)
+
+
+# ==================== CODIFICACIÓN ====================
+
+class CodificadorPrimos:
+    """
+    Escribe una lista creciente de primos en un archivo, por partes.
+
+    Los primos pueden agregarse en tantos bloques como se quiera (por
+    ejemplo, los que produce criba_segmentada); el índice de puntos de
+    control y el pie se escriben al cerrar.
+    """
+
+    def __init__(self, archivo: BinaryIO, intervalo: int = INTERVALO_PUNTOS_CONTROL):
+        """
+        Args:
+            archivo: Archivo binario abierto para escritura
+            intervalo: Cada cuántos primos se guarda un punto de control
+        """
+        self.archivo = archivo
+        self.intervalo = intervalo
+        self.total = 0
+        self._ultimo = None
+        self._posicion = 0  # bytes de datos escritos
+        self._valores_control = []
+        self._posiciones_control = []
+        archivo.write(struct.pack(FORMATO_CABECERA, FIRMA, VERSION, intervalo))
+
+    def agregar(self, primos) -> None:
+        """
+        Agrega primos al final de la lista.
+
+        Args:
+            primos: Secuencia creciente de primos mayores que el último agregado
+        """
+        primos = np.asarray(primos, dtype=np.int64)
+        if not len(primos):
+            return
+
+        secuencia = primos if self._ultimo is None else np.concatenate(([self._ultimo], primos))
+        brechas = np.diff(secuencia)
+        if (brechas <= 0).any():
+            raise ValueError("Los primos deben estar en orden estrictamente creciente")
+        if (brechas[secuencia[:-1] != 2] % 2).any():
+            raise ValueError("Solo se pueden codificar primos")
+
+        datos, longitudes = _codificar_varint((brechas // 2).astype(np.uint64))
+
+        # Puntos de control: primos cuyo índice global es múltiplo del intervalo,
+        # junto a la posición de la brecha que los sigue
+        indices = np.arange(self.total, self.total + len(primos))
+        en_control = indices % self.intervalo == 0
+        if en_control.any():
+            desplazamiento = 0 if self._ultimo is None else 1
+            bytes_previos = np.concatenate(([0], np.cumsum(longitudes)))
+            locales = np.flatnonzero(en_control)
+            self._valores_control.extend(primos[locales].tolist())
+            self._posiciones_control.extend(
+                (self._posicion + bytes_previos[locales + desplazamiento]).tolist())
+
+        self.archivo.write(datos.tobytes())
+        self._posicion += len(datos)
+        self.total += len(primos)
+        self._ultimo = int(primos[-1])
+
+    def cerrar(self) -> None:
+        """Escribe el índice de puntos de control y el pie."""
+        posicion_indice = TAMANO_CABECERA + self._posicion
+        self.archivo.write(np.array(self._valores_control, dtype=np.uint64).tobytes())
+        self.archivo.write(np.array(self._posiciones_control, dtype=np.uint64).tobytes())
+        self.archivo.write(struct.pack(FORMATO_PIE, self.total, len(self._valores_control),
+                                       posicion_indice, FIRMA))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, *args):
+        if tipo is None:
+            self.cerrar()
+
+
+def codificar_primos(primos, intervalo: int = INTERVALO_PUNTOS_CONTROL) -> bytes:
+    """
+    Codifica una lista creciente de primos en el formato compacto.
+
+    Args:
+        primos: Lista o arreglo de primos en orden creciente
+        intervalo: Cada cuántos primos se guarda un punto de control
+
+    Returns:
+        Bytes codificados (≈ 1 byte por primo)
+    """
+    salida = io.BytesIO()
+    with CodificadorPrimos(salida, intervalo) as codificador:
+        codificador.agregar(primos)
+    return salida.getvalue()
+
+
+# ==================== DECODIFICACIÓN ====================
+
+def _leer_pie(archivo: BinaryIO) -> Tuple[int, int, int, int]:
+    """Lee cabecera y pie. Retorna (intervalo, total, puntos_control, posicion_indice)."""
+    archivo.seek(0)
+    firma, version, intervalo = struct.unpack(FORMATO_CABECERA, archivo.read(TAMANO_CABECERA))
+    archivo.seek(-TAMANO_PIE, io.SEEK_END)
+    total, puntos_control, posicion_indice, firma_pie = struct.unpack(
+        FORMATO_PIE, archivo.read(TAMANO_PIE))
+
+    if firma != FIRMA or firma_pie != FIRMA or version != VERSION:
+        raise ValueError("Los datos no están en el formato de primos codificados")
+
+    return intervalo, total, puntos_control, posicion_indice
+
+
+def iterar_primos_codificados(archivo: BinaryIO,
+                              tamano_lectura: int = TAMANO_LECTURA) -> Iterator[np.ndarray]:
+    """
+    Decodifica un archivo en el formato compacto por partes.
+
+    Args:
+        archivo: Archivo binario abierto para lectura (debe admitir seek)
+        tamano_lectura: Bytes de datos leídos por vez
+
+    Yields:
+        Arreglos de NumPy (int64) con primos consecutivos
+    """
+    _, total, puntos_control, posicion_indice = _leer_pie(archivo)
+    if total == 0:
+        return
+
+    archivo.seek(posicion_indice)
+    ultimo = int(np.frombuffer(archivo.read(8), dtype=np.uint64)[0])
+    yield np.array([ultimo], dtype=np.int64)
+
+    archivo.seek(TAMANO_CABECERA)
+    pendientes = posicion_indice - TAMANO_CABECERA
+    sobrante = np.zeros(0, dtype=np.uint8)
+
+    while pendientes > 0:
+        leidos = archivo.read(min(tamano_lectura, pendientes))
+        pendientes -= len(leidos)
+        datos = np.concatenate((sobrante, np.frombuffer(leidos, dtype=np.uint8)))
+
+        # Un varint puede quedar partido entre dos lecturas
+        completos = len(datos) - int(np.argmax(datos[::-1] < 0x80)) if (datos < 0x80).any() else 0
+        sobrante = datos[completos:]
+        if completos:
+            primos = _reconstruir(ultimo, _decodificar_varint(datos[:completos]))
+            ultimo = int(primos[-1])
+            yield primos
+
+
+def decodificar_primos(datos: bytes) -> np.ndarray:
+    """
+    Decodifica bytes en el formato compacto.
+
+    Args:
+        datos: Bytes producidos por codificar_primos o CodificadorPrimos
+
+    Returns:
+        Arreglo de NumPy (int64) con los primos
+    """
+    partes = list(iterar_primos_codificados(io.BytesIO(datos), max(len(datos), 1)))
+    if not partes:
+        return np.zeros(0, dtype=np.int64)
+    return np.concatenate(partes)
+
+
+class ListaPrimosCodificada:
+    """
+    Acceso aleatorio a una lista de primos codificada sin descomprimirla.
+
+    Para obtener el k-ésimo primo se salta al punto de control anterior
+    y se decodifican a lo sumo intervalo brechas.
+    """
+
+    def __init__(self, datos: bytes):
+        """
+        Args:
+            datos: Bytes producidos por codificar_primos o CodificadorPrimos
+        """
+        self._datos = np.frombuffer(datos, dtype=np.uint8)
+        self.intervalo, self.total, puntos_control, posicion_indice = _leer_pie(io.BytesIO(datos))
+        indice = np.frombuffer(datos, dtype=np.uint64, count=2 * puntos_control,
+                               offset=posicion_indice)
+        self._valores_control = indice[:puntos_control]
+        self._posiciones_control = indice[puntos_control:]
+        self._fin_datos = posicion_indice
+
+    def __len__(self) -> int:
+        return self.total
+
+    def __getitem__(self, k: int) -> int:
+        if k < 0:
+            k += self.total
+        if not 0 <= k < self.total:
+            raise IndexError("Índice fuera de la lista de primos")
+        return int(self.primos(k, 1)[0])
+
+    def __iter__(self) -> Iterator[int]:
+        for inicio in range(0, self.total, self.intervalo):
+            yield from self.primos(inicio, self.intervalo).tolist()
+
+    def primos(self, inicio: int, cantidad: int) -> np.ndarray:
+        """
+        Primos que ocupan las posiciones [inicio, inicio + cantidad) (desde 0).
+
+        Args:
+            inicio: Posición del primer primo
+            cantidad: Cuántos primos obtener
+
+        Returns:
+            Arreglo de NumPy (int64), más corto si la lista termina antes
+        """
+        fin = min(inicio + cantidad, self.total)
+        if inicio >= fin:
+            return np.zeros(0, dtype=np.int64)
+
+        punto = inicio // self.intervalo
+        base = int(self._valores_control[punto])
+        desde = TAMANO_CABECERA + int(self._posiciones_control[punto])
+
+        # Recorrer los varint hasta el último primo pedido
+        necesarios = fin - 1 - punto * self.intervalo
+        if necesarios == 0:
+            return np.array([base], dtype=np.int64)
+        tramo = self._datos[desde:self._fin_datos]
+        finales = np.flatnonzero(tramo[:10 * necesarios] < 0x80)
+        valores = _decodificar_varint(tramo[:finales[necesarios - 1] + 1])
+
+        primos = np.concatenate(([base], _reconstruir(base, valores)))
+        return primos[inicio - punto * self.intervalo:]
+
+    def a_arreglo(self) -> np.ndarray:
+        """Todos los primos como arreglo de NumPy (int64)."""
+        return self.primos(0, self.total)
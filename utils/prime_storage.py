@@ -0,0 +1,284 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de almacenamiento persistente de números primos
+Construye y consulta una base de primos en disco (mapa de bits + índice de rangos)
+abierta con mmap, compartida sin copias por todos los procesos que la usan
+
+Uso para construir una base:
+    python -m utils.prime_storage primos.db --limite 10000000000
+"""
+
+import argparse
+import mmap
+import struct
+import time
+from typing import Optional
+
+import numpy as np
+
+from utils.prime_algorithms import criba_segmentada
+
+
+# ==================== FORMATO DEL ARCHIVO ====================
+
+# Cabecera de 64 bytes:
+#   firma (8s), versión (I), bits por bloque del índice (I), límite (Q),
+#   total de primos (Q), bytes del mapa de bits (Q),
+#   posición del índice de rangos (Q), entradas del índice de rangos (Q)
+FIRMA = b"PRIMOSDB"
+VERSION = 1
+FORMATO_CABECERA = "<8sIIQQQQQ"
+TAMANO_CABECERA = 64
+
+# Cada entrada del índice guarda cuántos primos impares hay antes de un
+# bloque de este tamaño (4096 bits = 512 bytes del mapa de bits)
+BITS_POR_BLOQUE = 4096
+
+# Cantidad de números cribados por tramo al construir la base
+# (múltiplo de 2 · BITS_POR_BLOQUE para que los tramos queden alineados)
+TAMANO_TRAMO = 1 << 24
+
+# Cantidad de bits encendidos en cada valor de byte
+_BITS_ENCENDIDOS = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+# ==================== CONSTRUCCIÓN ====================
+
+def construir_base_primos(ruta: str, limite: int, mostrar_progreso: bool = False) -> int:
+    """
+    Construye en disco la base de primos hasta un límite.
+
+    El mapa de bits guarda solo los impares (el bit i representa a 2i + 1)
+    y se escribe tramo a tramo, así que la memoria usada no depende del límite.
+
+    Args:
+        ruta: Archivo de destino (se sobrescribe)
+        limite: Mayor número cubierto por la base
+        mostrar_progreso: Imprimir el avance por tramo
+
+    Returns:
+        Cantidad total de primos ≤ limite
+    """
+    if limite < 2:
+        raise ValueError("El límite debe ser al menos 2")
+
+    rangos = [0]
+    total_impares = 0
+    bytes_mapa = 0
+    inicio_reloj = time.time()
+
+    with open(ruta, "wb") as archivo:
+        archivo.write(b"\0" * TAMANO_CABECERA)
+
+        for bajo in range(0, limite + 1, TAMANO_TRAMO):
+            alto = min(bajo + TAMANO_TRAMO - 1, limite)
+            primer_bit = bajo // 2
+            mapa = np.zeros((alto + 1) // 2 - primer_bit, dtype=bool)
+
+            for primos in criba_segmentada(max(bajo, 3), alto):
+                mapa[(primos >> 1) - primer_bit] = True
+
+            # Conteo acumulado de primos al final de cada bloque del índice
+            relleno = -len(mapa) % BITS_POR_BLOQUE
+            conteos = np.concatenate((mapa, np.zeros(relleno, dtype=bool)))
+            conteos = conteos.reshape(-1, BITS_POR_BLOQUE).sum(axis=1)
+            rangos.extend((total_impares + np.cumsum(conteos)).tolist())
+            total_impares += int(conteos.sum())
+
+            datos = np.packbits(mapa, bitorder="little").tobytes()
+            archivo.write(datos)
+            bytes_mapa += len(datos)
+
+            if mostrar_progreso:
+                print(f"{alto:,} / {limite:,}  ({time.time() - inicio_reloj:.1f} s)")
+
+        # El índice de rangos va después del mapa, alineado a 8 bytes
+        archivo.write(b"\0" * (-bytes_mapa % 8))
+        posicion_rangos = TAMANO_CABECERA + bytes_mapa + (-bytes_mapa % 8)
+        archivo.write(np.array(rangos, dtype=np.uint64).tobytes())
+
+        total_primos = total_impares + 1  # el 2
+        archivo.seek(0)
+        archivo.write(struct.pack(FORMATO_CABECERA, FIRMA, VERSION, BITS_POR_BLOQUE,
+                                  limite, total_primos, bytes_mapa,
+                                  posicion_rangos, len(rangos)))
+
+    return total_primos
+
+
+# ==================== CONSULTA ====================
+
+class BasePrimos:
+    """
+    Base de primos en disco abierta en modo solo lectura con mmap.
+
+    Las páginas del archivo las comparte el sistema operativo entre todos
+    los procesos que abren la misma base, sin copiarlas. Verificar un
+    número es O(1) y π(x), el n-ésimo primo, el siguiente y el anterior
+    solo leen un bloque del índice y un bloque del mapa de bits.
+    """
+
+    def __init__(self, ruta: str):
+        """
+        Args:
+            ruta: Archivo creado con construir_base_primos
+        """
+        self.ruta = ruta
+        self._archivo = open(ruta, "rb")
+        self._mmap = mmap.mmap(self._archivo.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (firma, version, bits_por_bloque, limite, total_primos, bytes_mapa,
+         posicion_rangos, entradas_rangos) = struct.unpack_from(FORMATO_CABECERA, self._mmap)
+
+        if firma != FIRMA or version != VERSION:
+            self.cerrar()
+            raise ValueError(f"{ruta} no es una base de primos válida")
+
+        self.limite = limite
+        self.total_primos = total_primos
+        self._bits_por_bloque = bits_por_bloque
+        self._total_bits = (limite + 1) // 2
+        self._mapa = np.frombuffer(self._mmap, dtype=np.uint8, count=bytes_mapa,
+                                   offset=TAMANO_CABECERA)
+        self._rangos = np.frombuffer(self._mmap, dtype=np.uint64, count=entradas_rangos,
+                                     offset=posicion_rangos)
+
+    def cerrar(self) -> None:
+        """Libera el mapeo de memoria y el archivo."""
+        self._mapa = self._rangos = None
+        self._mmap.close()
+        self._archivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.cerrar()
+
+    def _verificar_alcance(self, n: int) -> None:
+        if n > self.limite:
+            raise ValueError(f"{n} excede el límite de la base ({self.limite})")
+
+    def _bits(self, inicio: int, fin: int) -> np.ndarray:
+        """Bits del mapa en las posiciones [inicio, fin) como arreglo booleano."""
+        byte_inicio = inicio // 8
+        datos = self._mapa[byte_inicio:(fin + 7) // 8]
+        bits = np.unpackbits(datos, bitorder="little").astype(bool)
+        return bits[inicio - 8 * byte_inicio:fin - 8 * byte_inicio]
+
+    def _contar_bits(self, fin: int) -> int:
+        """Cantidad de bits encendidos en las posiciones [0, fin)."""
+        bloque = fin // self._bits_por_bloque
+        cantidad = int(self._rangos[bloque])
+
+        byte_inicio = bloque * self._bits_por_bloque // 8
+        cantidad += int(_BITS_ENCENDIDOS[self._mapa[byte_inicio:fin // 8]].sum())
+        if fin % 8:
+            cantidad += bin(int(self._mapa[fin // 8]) & ((1 << (fin % 8)) - 1)).count("1")
+
+        return cantidad
+
+    def es_primo(self, n: int) -> bool:
+        """Indica si n es primo."""
+        if n < 2:
+            return False
+        self._verificar_alcance(n)
+        if n % 2 == 0:
+            return n == 2
+        i = n >> 1
+        return bool((self._mapa[i >> 3] >> (i & 7)) & 1)
+
+    def contar_hasta(self, n: int) -> int:
+        """Cantidad de primos ≤ n, es decir π(n)."""
+        if n < 2:
+            return 0
+        self._verificar_alcance(n)
+        return 1 + self._contar_bits((n - 1) // 2 + 1)
+
+    def enesimo(self, k: int) -> Optional[int]:
+        """El k-ésimo primo (1 = 2), o None si excede el límite de la base."""
+        if k < 1 or k > self.total_primos:
+            return None
+        if k == 1:
+            return 2
+
+        # Buscar el bloque que contiene al (k - 1)-ésimo primo impar
+        objetivo = k - 1
+        bloque = int(np.searchsorted(self._rangos, np.uint64(objetivo), side="left")) - 1
+        inicio = bloque * self._bits_por_bloque
+        bits = self._bits(inicio, min(inicio + self._bits_por_bloque, self._total_bits))
+        posicion = np.flatnonzero(bits)[objetivo - int(self._rangos[bloque]) - 1]
+
+        return 2 * (inicio + int(posicion)) + 1
+
+    def siguiente(self, n: int) -> Optional[int]:
+        """Menor primo mayor que n, o None si excede el límite de la base."""
+        if n < 2:
+            return 2
+
+        inicio = (n + 1) // 2  # bit del primer impar mayor que n
+        while inicio < self._total_bits:
+            fin = min(inicio + self._bits_por_bloque, self._total_bits)
+            encontrados = np.flatnonzero(self._bits(inicio, fin))
+            if encontrados.size:
+                return 2 * (inicio + int(encontrados[0])) + 1
+            inicio = fin
+
+        return None
+
+    def anterior(self, n: int) -> Optional[int]:
+        """Mayor primo menor que n, o None si no existe."""
+        if n <= 2:
+            return None
+        self._verificar_alcance(n - 1)
+
+        fin = n // 2  # bits de los impares menores que n
+        while fin > 0:
+            inicio = max(fin - self._bits_por_bloque, 0)
+            encontrados = np.flatnonzero(self._bits(inicio, fin))
+            if encontrados.size:
+                return 2 * (inicio + int(encontrados[-1])) + 1
+            fin = inicio
+
+        return 2
+
+    def primos_en_rango(self, inicio: int, fin: int) -> np.ndarray:
+        """Arreglo de NumPy (int64) con los primos del intervalo [inicio, fin]."""
+        inicio = max(inicio, 2)
+        if fin < inicio:
+            return np.zeros(0, dtype=np.int64)
+        self._verificar_alcance(fin)
+
+        primer_bit = inicio // 2
+        bits = self._bits(primer_bit, (fin - 1) // 2 + 1)
+        primos = 2 * (primer_bit + np.flatnonzero(bits).astype(np.int64)) + 1
+
+        if inicio == 2:
+            primos = np.concatenate((np.array([2], dtype=np.int64), primos))
+
+        return primos
+
+
+def abrir_base_primos(ruta: str) -> BasePrimos:
+    """
+    Abre una base de primos en disco en modo solo lectura.
+
+    Args:
+        ruta: Archivo creado con construir_base_primos
+
+    Returns:
+        Objeto BasePrimos listo para consultar
+    """
+    return BasePrimos(ruta)
+
+
+# ==================== LÍNEA DE COMANDOS ====================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Construye una base de primos en disco")
+    parser.add_argument("ruta", help="Archivo de destino")
+    parser.add_argument("--limite", type=int, default=10**9, help="Mayor número cubierto")
+    args = parser.parse_args()
+
+    total = construir_base_primos(args.ruta, args.limite, mostrar_progreso=True)
+    print(f"Base creada en {args.ruta}: {total:,} primos hasta {args.limite:,}")
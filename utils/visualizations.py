@@ -11,6 +11,10 @@ import numpy as np
 import math
 
 
+# Por encima de esta cantidad de celdas el heatmap de la criba no lleva números
+MAX_ANOTACIONES_CRIBA = 400
+
+
 def grafico_distribucion_primos(limite: int, primos: list):
     """
     Crea un gráfico de distribución de números primos.
@@ -63,8 +67,8 @@ def grafico_funcion_pi(limite: int, primos: list):
     # Generar valores de x
     x_values = list(range(2, limite + 1, max(1, limite // 1000)))
 
-    # Calcular π(x) - cantidad de primos hasta x
-    pi_values = [sum(1 for p in primos if p <= x) for x in x_values]
+    # Calcular π(x) - cantidad de primos hasta x (búsqueda binaria en la lista ordenada)
+    pi_values = np.searchsorted(primos, x_values, side='right')
 
     # Calcular aproximación x/ln(x)
     aprox_values = [x / np.log(x) for x in x_values]
@@ -109,6 +113,66 @@ def grafico_funcion_pi(limite: int, primos: list):
     return fig
 
 
+def grafico_funcion_aritmetica(numeros, valores, funcion: str):
+    """
+    Crea un gráfico de dispersión de una función aritmética.
+
+    Args:
+        numeros: Valores de n
+        valores: Valores de la función en cada n
+        funcion: Nombre de la función ("phi", "mu", "divisores" o "sigma")
+
+    Returns:
+        Figura de Plotly
+    """
+    titulos = {
+        'phi': ('φ(n): Función de Euler', 'φ(n)'),
+        'mu': ('μ(n): Función de Möbius', 'μ(n)'),
+        'divisores': ('d(n): Cantidad de Divisores', 'd(n)'),
+        'sigma': ('σ(n): Suma de Divisores', 'σ(n)')
+    }
+    titulo, etiqueta = titulos[funcion]
+
+    numeros = np.asarray(numeros)
+
+    # Crear figura (WebGL para poder mostrar muchos puntos)
+    fig = go.Figure()
+
+    fig.add_trace(go.Scattergl(
+        x=numeros,
+        y=np.asarray(valores),
+        mode='markers',
+        name=etiqueta,
+        marker=dict(color='#1f77b4', size=3),
+        hovertemplate=f'n: %{{x}}<br>{etiqueta}: %{{y}}<extra></extra>'
+    ))
+
+    # Referencias: los primos cumplen φ(p) = p - 1 y los números perfectos σ(n) = 2n
+    referencias = {
+        'phi': (numeros - 1, 'n - 1 (primos)'),
+        'sigma': (2 * numeros, '2n (números perfectos)')
+    }
+    if funcion in referencias:
+        y_referencia, nombre = referencias[funcion]
+        fig.add_trace(go.Scattergl(
+            x=numeros,
+            y=y_referencia,
+            mode='lines',
+            name=nombre,
+            line=dict(color='#ff7f0e', width=1, dash='dash')
+        ))
+
+    fig.update_layout(
+        title=titulo,
+        xaxis_title='n',
+        yaxis_title=etiqueta,
+        template='plotly_white',
+        legend=dict(x=0.02, y=0.98)
+    )
+
+    return fig
+
+
 def espiral_ulam(dimension: int, primos: list):
     """
     Crea una Espiral de Ulam destacando números primos.
@@ -249,54 +313,57 @@ def visualizar_factorizacion(n: int, factores: dict):
     return fig
 
 
-def heatmap_criba(estado: list, dimension: int):
+def heatmap_criba(estado: list, dimension: int, marcados=None):
     """
     Crea un heatmap para visualizar el estado de la Criba de Eratóstenes.
 
     Args:
-        estado: Lista booleana indicando si cada número es primo
+        estado: Lista o arreglo booleano indicando si cada número es primo
         dimension: Dimensión de la cuadrícula
+        marcados: Índices marcados en el paso actual, que se resaltan (opcional)
 
     Returns:
         Figura de Plotly
     """
     # Calcular dimensiones de la matriz
+    estado = np.asarray(estado, dtype=bool)
     n_elementos = len(estado)
     cols = dimension
     rows = math.ceil(n_elementos / cols)
 
-    # Crear matriz
-    matriz = np.zeros((rows, cols))
-    for i, es_primo in enumerate(estado):
-        if i < n_elementos:
-            row = i // cols
-            col = i % cols
-            matriz[row][col] = 1 if es_primo else 0
+    # Crear matriz: 1 = primo, 0 = compuesto, 0.5 = recién marcado, vacío = fuera del límite
+    valores = np.full(rows * cols, np.nan)
+    valores[:n_elementos] = estado
+    if marcados is not None:
+        valores[np.asarray(marcados)] = 0.5
+    matriz = valores.reshape(rows, cols)
 
-    # Crear anotaciones con los números
+    # Crear anotaciones con los números (solo si la cuadrícula es pequeña)
     annotations = []
-    for i in range(n_elementos):
-        row = i // cols
-        col = i % cols
-        color = 'white' if estado[i] else 'black'
-        annotations.append(
-            dict(
-                x=col,
-                y=row,
-                text=str(i),
-                showarrow=False,
-                font=dict(color=color, size=10)
+    if n_elementos <= MAX_ANOTACIONES_CRIBA:
+        for i in range(n_elementos):
+            row = i // cols
+            col = i % cols
+            color = 'white' if estado[i] else 'black'
+            annotations.append(
+                dict(
+                    x=col,
+                    y=row,
+                    text=str(i),
+                    showarrow=False,
+                    font=dict(color=color, size=10)
+                )
             )
-        )
 
     # Crear heatmap
     fig = go.Figure(data=go.Heatmap(
         z=matriz,
-        colorscale=[[0, '#e74c3c'], [1, '#27ae60']],
+        zmin=0,
+        zmax=1,
+        colorscale=[[0, '#e74c3c'], [0.5, '#f39c12'], [1, '#27ae60']],
         showscale=False,
-        hovertemplate='Número: %{text}<extra></extra>',
-        text=[[str(i + j * cols) if (i + j * cols) < n_elementos else ''
-               for i in range(cols)] for j in range(rows)]
+        hovertemplate='Número: %{customdata}<extra></extra>',
+        customdata=np.arange(rows * cols).reshape(rows, cols)
     ))
 
     fig.update_layout(
@@ -326,13 +393,14 @@ def grafico_brechas_primos(primos: list):
         return None
 
     # Calcular brechas
-    brechas = [primos[i + 1] - primos[i] for i in range(len(primos) - 1)]
+    primos = np.asarray(primos)
+    brechas = np.diff(primos)
     posiciones = primos[:-1]
 
-    # Crear figura
+    # Crear figura (WebGL para poder mostrar muchos puntos)
     fig = go.Figure()
 
-    fig.add_trace(go.Scatter(
+    fig.add_trace(go.Scattergl(
         x=posiciones,
         y=brechas,
         mode='markers',
@@ -356,6 +424,144 @@ def grafico_brechas_primos(primos: list):
     return fig
 
 
+def grafico_cometa_goldbach(conteos):
+    """
+    Crea el "cometa de Goldbach": particiones de cada número par.
+
+    Args:
+        conteos: conteos[n] = cantidad de particiones de Goldbach de 2n
+
+    Returns:
+        Figura de Plotly
+    """
+    conteos = np.asarray(conteos)
+    pares = 2 * np.arange(2, len(conteos))
+    particiones = conteos[2:]
+
+    # Los múltiplos de 3 forman la banda superior del cometa
+    multiplos_3 = pares % 3 == 0
+
+    fig = go.Figure()
+
+    for mascara, nombre, color in [(~multiplos_3, 'No múltiplos de 3', '#1f77b4'),
+                                   (multiplos_3, 'Múltiplos de 3', '#2ca02c')]:
+        fig.add_trace(go.Scattergl(
+            x=pares[mascara],
+            y=particiones[mascara],
+            mode='markers',
+            name=nombre,
+            marker=dict(color=color, size=2),
+            hovertemplate='Número par: %{x}<br>Particiones: %{y}<extra></extra>'
+        ))
+
+    # Estimación de Hardy-Littlewood para el borde inferior: C₂ · x / ln²(x)
+    x_referencia = np.linspace(max(pares[0], 6), pares[-1], 200)
+    fig.add_trace(go.Scatter(
+        x=x_referencia,
+        y=0.6601618 * x_referencia / np.log(x_referencia) ** 2,
+        mode='lines',
+        name='C₂ · x / ln²(x)',
+        line=dict(color='#ff7f0e', width=2, dash='dash')
+    ))
+
+    fig.update_layout(
+        title='Cometa de Goldbach',
+        xaxis_title='Número par',
+        yaxis_title='Particiones p + q (p ≤ q)',
+        template='plotly_white',
+        legend=dict(x=0.02, y=0.98)
+    )
+
+    return fig
+
+
+def grafico_histograma_brechas(histograma):
+    """
+    Crea el histograma de brechas entre primos consecutivos.
+
+    Args:
+        histograma: histograma[g] = cantidad de pares de primos consecutivos con brecha g
+
+    Returns:
+        Figura de Plotly
+    """
+    histograma = np.asarray(histograma)
+    brechas = np.flatnonzero(histograma)
+    campeon = int(np.argmax(histograma))
+
+    colores = np.where(brechas == campeon, '#d62728', '#1f77b4')
+
+    fig = go.Figure()
+
+    fig.add_trace(go.Bar(
+        x=brechas,
+        y=histograma[brechas],
+        marker_color=colores,
+        hovertemplate='Brecha: %{x}<br>Frecuencia: %{y:,}<extra></extra>'
+    ))
+
+    fig.update_layout(
+        title=f'Histograma de Brechas (campeón de saltos: {campeon})',
+        xaxis_title='Brecha',
+        yaxis_title='Frecuencia',
+        yaxis_type='log',
+        template='plotly_white'
+    )
+
+    return fig
+
+
+def grafico_brechas_maximales(records: list):
+    """
+    Visualiza las brechas récord frente a la cota de Cramér ln²(p).
+
+    Args:
+        records: Lista de tuplas (brecha, primo, brecha / ln²(primo))
+
+    Returns:
+        Figura de Plotly
+    """
+    if not records:
+        return None
+
+    brechas = np.array([r[0] for r in records])
+    primos = np.array([r[1] for r in records])
+    cocientes = np.array([r[2] for r in records])
+
+    fig = go.Figure()
+
+    fig.add_trace(go.Scatter(
+        x=primos,
+        y=brechas,
+        mode='lines+markers',
+        name='Brecha récord',
+        line=dict(color='#1f77b4', shape='hv'),
+        customdata=cocientes,
+        hovertemplate='Primo: %{x:,}<br>Brecha: %{y}<br>g / ln²(p): %{customdata:.3f}<extra></extra>'
+    ))
+
+    # Referencia: conjetura de Cramér, g ≈ ln²(p)
+    x_cramer = np.geomspace(max(primos[0], 3), primos[-1], 200)
+    fig.add_trace(go.Scatter(
+        x=x_cramer,
+        y=np.log(x_cramer) ** 2,
+        mode='lines',
+        name='ln²(p) (Cramér)',
+        line=dict(color='#ff7f0e', width=2, dash='dash')
+    ))
+
+    fig.update_layout(
+        title='Brechas Máximas entre Primos',
+        xaxis_title='Primo inicial',
+        yaxis_title='Brecha',
+        xaxis_type='log',
+        template='plotly_white',
+        legend=dict(x=0.02, y=0.98)
+    )
+
+    return fig
+
+
 def grafico_estadisticas_sesion(historial: list):
     """
     Crea gráfico de estadísticas de la sesión.